@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the JSON codec on representative Zendesk payloads.
+
+Compares the previous stdlib path (json.loads(body.decode()) and
+json.dumps(indent=2)) with zendesk_mcp_server.codec on a 100-ticket page and
+a full knowledge base payload. Install the `fast` extra to measure orjson.
+
+Importing the package initializes the server module, so the ZENDESK_*
+variables must be set (or present in .env). No requests are made.
+
+Usage:
+    python benchmarks/bench_codec.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zendesk_mcp_server import codec  # noqa: E402
+
+
+def ticket_page(count: int = 100) -> dict:
+    return {
+        "tickets": [{
+            "id": 1000 + i,
+            "url": f"https://example.zendesk.com/api/v2/tickets/{1000 + i}.json",
+            "subject": f"Cannot export report #{i}",
+            "description": "The export button spins forever when the report has more than 10k rows. " * 8,
+            "status": "open",
+            "priority": "high",
+            "type": "incident",
+            "created_at": "2024-06-01T10:00:00Z",
+            "updated_at": "2024-06-02T12:30:00Z",
+            "requester_id": 360000000 + i,
+            "assignee_id": 361000000 + i % 7,
+            "organization_id": 362000000 + i % 13,
+            "group_id": 363000000,
+            "tags": ["export", "reports", "enterprise"],
+            "custom_fields": [{"id": 364000000 + f, "value": None} for f in range(12)],
+            "via": {"channel": "email", "source": {"from": {}, "to": {}, "rel": None}},
+        } for i in range(count)],
+        "next_page": "https://example.zendesk.com/api/v2/tickets.json?page=2",
+        "previous_page": None,
+        "count": 5000,
+    }
+
+
+def knowledge_base(sections: int = 40, articles: int = 50) -> dict:
+    body = "<p>" + "Step-by-step instructions with <a href='#'>links</a> and <b>formatting</b>. " * 60 + "</p>"
+    return {
+        f"Section {s}": {
+            "section_id": 200000 + s,
+            "description": f"Articles about topic {s}",
+            "articles": [{
+                "id": 300000 + s * 1000 + a,
+                "title": f"How to configure feature {a}",
+                "body": body,
+                "updated_at": "2024-05-01 09:00:00+00:00",
+                "url": f"https://example.zendesk.com/hc/articles/{300000 + s * 1000 + a}",
+            } for a in range(articles)],
+        } for s in range(sections)
+    }
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<34} {seconds * 1000:9.3f} ms")
+    return seconds
+
+
+def main():
+    print(f"codec backend: {codec.BACKEND}\n")
+    for name, payload, number in [
+        ("100-ticket page", ticket_page(), 200),
+        ("knowledge base", knowledge_base(), 5),
+    ]:
+        body = json.dumps(payload).encode()
+        print(f"{name} ({len(body) / 1024:.0f} KiB)")
+        old = bench("parse: json.loads(body.decode())", lambda: json.loads(body.decode()), number)
+        new = bench("parse: codec.loads(body)", lambda: codec.loads(body), number)
+        print(f"  {'speedup':<34} {old / new:9.2f}x")
+        old = bench("encode: json.dumps(indent=2)", lambda: json.dumps(payload, indent=2), number)
+        new = bench("encode: codec.dumps(indent=True)", lambda: codec.dumps(payload, indent=True), number)
+        print(f"  {'speedup':<34} {old / new:9.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the cached knowledge base.
+
+Compares the previous representation (nested dicts with raw HTML bodies, read
+as pretty-printed JSON) with KnowledgeBaseStore (slotted records, shared
+section metadata, zlib-compressed bodies, rendered compactly). Retained memory
+of the cached copy and peak memory of one resource read are measured with
+tracemalloc on a synthetic help center whose article bodies vary in wording.
+
+Importing the package initializes the server module, so the ZENDESK_*
+variables must be set (or present in .env). No requests are made.
+
+Usage:
+    python benchmarks/bench_kb_store.py [sections] [articles_per_section]
+"""
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zendesk_mcp_server import codec  # noqa: E402
+from zendesk_mcp_server.kb_store import KnowledgeBaseStore  # noqa: E402
+
+WORDS = (
+    "account admin agent api billing browser cache click configure customer dashboard "
+    "data default email enable error export feature field filter group help invoice "
+    "login macro mobile notification option page password permission plan report "
+    "request role search settings sla support team ticket trigger update user view "
+    "workflow"
+).split()
+
+
+def article_body(rng: random.Random, paragraphs: int = 12) -> str:
+    return "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))) + ". "
+        + f"<a href='/hc/articles/{rng.randint(1, 10 ** 6)}'>See also</a></p>\n"
+        for _ in range(paragraphs)
+    )
+
+
+def knowledge_base(sections: int, articles: int) -> dict:
+    rng = random.Random(0)
+    return {
+        f"Section {s}": {
+            "section_id": 200000 + s,
+            "description": f"Articles about topic {s}",
+            "articles": [{
+                "id": 300000 + s * 1000 + a,
+                "title": f"How to configure {rng.choice(WORDS)} {rng.choice(WORDS)} {a}",
+                "body": article_body(rng),
+                "updated_at": "2024-05-01T09:00:00Z",
+                "url": f"https://example.zendesk.com/hc/articles/{300000 + s * 1000 + a}",
+            } for a in range(articles)],
+        } for s in range(sections)
+    }
+
+
+def retained(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def read_peak(render) -> int:
+    gc.collect()
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    articles = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    payload = codec.dumpb(knowledge_base(sections, articles))
+    print(f"codec backend: {codec.BACKEND}")
+    print(f"{sections} sections x {articles} articles, {len(payload) / 2 ** 20:.1f} MiB of JSON\n")
+
+    kb, dict_size = retained(lambda: codec.loads(payload))
+    store, store_size = retained(lambda: KnowledgeBaseStore.from_dict(codec.loads(payload)))
+    dict_read = read_peak(lambda: codec.dumps({"knowledge_base": kb, "metadata": {}}, indent=True))
+    store_read = read_peak(lambda: "".join(store.iter_json()))
+
+    print(f"{'':<22} {'retained':>12} {'read peak':>12}")
+    print(f"{'nested dicts':<22} {dict_size / 2 ** 20:9.1f} MiB {dict_read / 2 ** 20:9.1f} MiB")
+    print(f"{'KnowledgeBaseStore':<22} {store_size / 2 ** 20:9.1f} MiB {store_read / 2 ** 20:9.1f} MiB")
+    print(f"{'reduction':<22} {dict_size / store_size:11.1f}x {dict_read / store_read:11.1f}x")
+
+    budget = store.size // 2
+    bounded, bounded_size = retained(
+        lambda: KnowledgeBaseStore.from_dict(codec.loads(payload), max_bytes=budget)
+    )
+    stats = bounded.stats()
+    print(f"\nwith a {budget / 2 ** 20:.1f} MiB budget: {bounded_size / 2 ** 20:.1f} MiB retained, "
+          f"{stats['evicted_bodies']} of {stats['articles']} bodies evicted")
+
+
+if __name__ == "__main__":
+    main()
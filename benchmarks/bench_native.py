@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark the native read path against zenpy object hydration.
+
+Both paths start from the same raw response bytes. The zenpy path decodes the
+body, hydrates API objects through zenpy's object mapping and copies the
+attributes the tools return; the native path parses the bytes and maps them
+straight to dicts (ZENDESK_BACKEND=native). CPU time and allocations
+(tracemalloc) are reported for a single ticket, a 100-comment page and a
+100-article page. No requests are made.
+
+Importing the package initializes the server module, so the ZENDESK_*
+variables must be set (or present in .env).
+
+Usage:
+    python benchmarks/bench_native.py
+"""
+
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zenpy import Zenpy  # noqa: E402
+
+from zendesk_mcp_server import codec  # noqa: E402
+from zendesk_mcp_server.zendesk_client import _comment_record, _ticket_record  # noqa: E402
+
+zenpy_client = Zenpy(subdomain="example", email="bench@example.com", token="token")
+ticket_mapping = zenpy_client.tickets._object_mapping
+help_center_mapping = zenpy_client.help_center.articles._object_mapping
+
+
+def raw_ticket(i: int = 1) -> dict:
+    return {
+        "id": i,
+        "url": f"https://example.zendesk.com/api/v2/tickets/{i}.json",
+        "subject": "Cannot export report",
+        "description": "The export button spins forever when the report has more than 10k rows. " * 8,
+        "status": "open",
+        "priority": "high",
+        "type": "incident",
+        "created_at": "2024-06-01T10:00:00Z",
+        "updated_at": "2024-06-02T12:30:00Z",
+        "requester_id": 360000000 + i,
+        "submitter_id": 360000000 + i,
+        "assignee_id": 361000000,
+        "organization_id": 362000000,
+        "group_id": 363000000,
+        "tags": ["export", "reports", "enterprise"],
+        "custom_fields": [{"id": 364000000 + f, "value": None} for f in range(12)],
+        "via": {"channel": "email", "source": {"from": {}, "to": {}, "rel": None}},
+        "satisfaction_rating": {"score": "unoffered"},
+    }
+
+
+def raw_comment(i: int) -> dict:
+    return {
+        "id": 500000 + i,
+        "type": "Comment",
+        "author_id": 360000000 + i % 3,
+        "body": "Thanks for the details, we are looking into it. " * 10,
+        "html_body": "<div><p>" + "Thanks for the details, we are looking into it. " * 10 + "</p></div>",
+        "plain_body": "Thanks for the details, we are looking into it. " * 10,
+        "public": True,
+        "attachments": [],
+        "audit_id": 600000 + i,
+        "via": {"channel": "web", "source": {"from": {}, "to": {}, "rel": None}},
+        "created_at": "2024-06-01T10:00:00Z",
+        "metadata": {"system": {"client": "Mozilla/5.0", "ip_address": "10.0.0.1"}},
+    }
+
+
+def raw_article(i: int) -> dict:
+    return {
+        "id": 300000 + i,
+        "url": f"https://example.zendesk.com/api/v2/help_center/articles/{300000 + i}.json",
+        "html_url": f"https://example.zendesk.com/hc/articles/{300000 + i}",
+        "author_id": 360000000,
+        "section_id": 200000,
+        "title": f"How to configure feature {i}",
+        "body": "<p>" + "Step-by-step instructions with <b>formatting</b>. " * 60 + "</p>",
+        "locale": "en-us",
+        "draft": False,
+        "promoted": False,
+        "label_names": ["setup"],
+        "created_at": "2024-05-01T09:00:00Z",
+        "updated_at": "2024-05-01T09:00:00Z",
+    }
+
+
+def zenpy_ticket(body: bytes) -> dict:
+    ticket = ticket_mapping.object_from_json("ticket", json.loads(body.decode())["ticket"])
+    return {
+        "id": ticket.id,
+        "subject": ticket.subject,
+        "description": ticket.description,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "created_at": str(ticket.created_at),
+        "updated_at": str(ticket.updated_at),
+        "requester_id": ticket.requester_id,
+        "assignee_id": ticket.assignee_id,
+        "organization_id": ticket.organization_id,
+        "tags": list(getattr(ticket, "tags", []) or []),
+    }
+
+
+def native_ticket(body: bytes) -> dict:
+    return _ticket_record(codec.loads(body)["ticket"])
+
+
+def zenpy_comments(body: bytes) -> list:
+    comments = [ticket_mapping.object_from_json("comment", c) for c in json.loads(body.decode())["comments"]]
+    return [{
+        "id": comment.id,
+        "author_id": comment.author_id,
+        "body": comment.body,
+        "html_body": comment.html_body,
+        "public": comment.public,
+        "created_at": str(comment.created_at),
+    } for comment in comments]
+
+
+def native_comments(body: bytes) -> list:
+    return [_comment_record(comment) for comment in codec.loads(body)["comments"]]
+
+
+def zenpy_articles(body: bytes) -> list:
+    articles = [help_center_mapping.object_from_json("article", a) for a in json.loads(body.decode())["articles"]]
+    return [{
+        "id": article.id,
+        "title": article.title,
+        "body": article.body,
+        "updated_at": str(article.updated_at),
+        "url": article.html_url,
+    } for article in articles]
+
+
+def native_articles(body: bytes) -> list:
+    return [{
+        "id": article.get("id"),
+        "title": article.get("title"),
+        "body": article.get("body"),
+        "updated_at": article.get("updated_at"),
+        "url": article.get("html_url"),
+    } for article in codec.loads(body)["articles"]]
+
+
+def measure(func, body: bytes, number: int) -> tuple:
+    seconds = min(timeit.repeat(lambda: func(body), number=number, repeat=5)) / number
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    print(f"codec backend: {codec.BACKEND}\n")
+    cases = [
+        ("get_ticket", json.dumps({"ticket": raw_ticket()}).encode(), zenpy_ticket, native_ticket, 2000),
+        ("100 comments", json.dumps({"comments": [raw_comment(i) for i in range(100)]}).encode(),
+         zenpy_comments, native_comments, 50),
+        ("100 articles", json.dumps({"articles": [raw_article(i) for i in range(100)]}).encode(),
+         zenpy_articles, native_articles, 50),
+    ]
+    print(f"{'payload':<14} {'path':<7} {'time':>11} {'peak alloc':>12}")
+    for name, body, zenpy_func, native_func, number in cases:
+        zenpy_time, zenpy_peak = measure(zenpy_func, body, number)
+        native_time, native_peak = measure(native_func, body, number)
+        print(f"{name:<14} {'zenpy':<7} {zenpy_time * 1e6:8.1f} us {zenpy_peak / 1024:9.1f} KiB")
+        print(f"{'':<14} {'native':<7} {native_time * 1e6:8.1f} us {native_peak / 1024:9.1f} KiB"
+              f"   ({zenpy_time / native_time:.1f}x faster, {zenpy_peak / max(native_peak, 1):.1f}x less memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the find_similar_tickets index.
+
+Indexes a synthetic set of tickets whose words follow a Zipf distribution, as
+words in real tickets do, then times queries by ticket id and by free text. For
+comparison, the same query is answered by scoring every ticket's TF-IDF vector,
+which is what comparing a whole ticket list amounts to. No requests are made.
+
+Importing the package initializes the server module, so the ZENDESK_*
+variables must be set (or present in .env).
+
+Usage:
+    python benchmarks/bench_similarity.py [tickets] [queries]
+"""
+
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zendesk_mcp_server.similarity import SimilarityIndex  # noqa: E402
+
+VOCABULARY = [f"word{i}" for i in range(20000)]
+ZIPF_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def tickets(count: int) -> list:
+    rng = random.Random(0)
+    return [{
+        "id": ticket_id,
+        "subject": " ".join(rng.choices(VOCABULARY, ZIPF_WEIGHTS, k=7)),
+        "description": " ".join(rng.choices(VOCABULARY, ZIPF_WEIGHTS, k=rng.randint(30, 150))),
+        "status": "open",
+        "updated_at": "2024-05-01T09:00:00Z",
+    } for ticket_id in range(1, count + 1)]
+
+
+def brute_force(index: SimilarityIndex, ticket_id: int, limit: int = 5) -> list:
+    # Full TF-IDF vectors for every ticket, scored one by one
+    idf = {term: index._idf(term) for term in index._postings}
+    query = {term: weight * idf[term] for term, weight in index._terms[ticket_id].items()}
+    query_norm = math.sqrt(sum(weight ** 2 for weight in query.values()))
+    scores = []
+    for candidate, weights in index._terms.items():
+        vector = {term: weight * idf[term] for term, weight in weights.items()}
+        norm = math.sqrt(sum(weight ** 2 for weight in vector.values()))
+        dot = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+        scores.append((dot / (query_norm * norm), candidate))
+    return sorted(scores, reverse=True)[1:limit + 1]
+
+
+def timed(function, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<24} p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    records = tickets(count)
+    index = SimilarityIndex(max_tickets=count)
+
+    started = time.perf_counter()
+    for start in range(0, count, 1000):
+        index.add_many(records[start:start + 1000])
+    elapsed = time.perf_counter() - started
+    print(f"indexed {count} tickets in {elapsed:.2f} s ({count / elapsed:,.0f} tickets/s), "
+          f"{index.stats()['terms']} terms\n")
+
+    rng = random.Random(1)
+    sample = rng.sample(range(1, count + 1), queries)
+    report("by ticket id", [timed(index.similar, ticket_id=ticket_id) for ticket_id in sample])
+    report("by free text", [
+        timed(index.similar, text=records[ticket_id - 1]["subject"]) for ticket_id in sample
+    ])
+    report("score every ticket", [timed(brute_force, index, ticket_id) for ticket_id in sample[:5]])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,34 @@
+import argparse
 import asyncio
 
-from . import server
+from . import codec, server
 
 
 def main():
+    parser = argparse.ArgumentParser(prog="zendesk", description="Zendesk MCP server (runs over stdio without a command)")
+    commands = parser.add_subparsers(dest="command")
+
+    export = commands.add_parser("export-tickets", help="Export tickets updated in a time range to a local NDJSON file")
+    export.add_argument("path", help="Output file, gzip-compressed when it ends with .gz")
+    export.add_argument("--start", required=True, help="Tickets updated at or after this time (ISO 8601 or unix seconds)")
+    export.add_argument("--end", help="Skip tickets updated after this time (ISO 8601 or unix seconds)")
+    export.add_argument("--comments", action="store_true", help="Include each ticket's comments")
+    export.add_argument("--concurrency", type=int, default=4, help="Tickets whose comments are fetched at once")
+    export.add_argument("--no-resume", action="store_true", help="Start over instead of resuming from a checkpoint")
+
+    args = parser.parse_args()
+    if args.command == "export-tickets":
+        result = server.zendesk_client.export_tickets(
+            path=args.path,
+            start_time=args.start,
+            end_time=args.end,
+            include_comments=args.comments,
+            resume=not args.no_resume,
+            comment_concurrency=args.concurrency
+        )
+        print(codec.dumps(result, indent=True))
+        return
+
     asyncio.run(server.main())
 
 
@@ -0,0 +1,170 @@
+from typing import Dict, Any, Iterator, List
+from datetime import datetime, timezone
+import gzip
+import heapq
+import os
+import random
+
+from zendesk_mcp_server import codec
+
+# Ticket fields that can be used for group-by breakdowns
+GROUPABLE_FIELDS = [
+    'status', 'priority', 'type', 'assignee_id', 'requester_id',
+    'organization_id', 'group_id', 'brand_id', 'submitter_id'
+]
+
+UNRESOLVED_STATUSES = {'new', 'open', 'pending', 'hold'}
+
+PERCENTILES = [50, 75, 90, 95, 99]
+
+
+def _parse_time(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def iter_ndjson_tickets(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read raw tickets from a local NDJSON mirror (optionally gzip-compressed).
+    """
+    path = os.path.expanduser(path)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield codec.loads(line)
+
+
+def matches_filters(ticket: Dict[str, Any], filters: Dict[str, Any] | None) -> bool:
+    """
+    Check a raw ticket against equality filters. A list value matches any of its items.
+    """
+    if not filters:
+        return True
+    for field, expected in filters.items():
+        value = ticket.get(field)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class TicketAggregator:
+    """
+    Single-pass aggregation over a stream of raw tickets with bounded memory.
+
+    Group counts are capped at max_groups distinct keys, ages are kept in a
+    fixed-size reservoir sample (exact below sample_size tickets), and only
+    the oldest_limit oldest unresolved tickets are retained.
+    """
+
+    def __init__(
+        self,
+        group_by: List[str] | None = None,
+        oldest_limit: int = 10,
+        max_groups: int = 500,
+        sample_size: int = 10000,
+        now: datetime | None = None
+    ):
+        group_by = group_by or []
+        invalid = [field for field in group_by if field not in GROUPABLE_FIELDS]
+        if invalid:
+            raise ValueError(f"Invalid group_by fields: {', '.join(invalid)}. Must be among: {', '.join(GROUPABLE_FIELDS)}")
+
+        self.group_by = group_by
+        self.oldest_limit = oldest_limit
+        self.max_groups = max_groups
+        self.sample_size = sample_size
+        self.now = now or datetime.now(timezone.utc)
+
+        self.total = 0
+        self.unresolved = 0
+        self.groups: Dict[tuple, int] = {}
+        self.other_count = 0
+        self._ages: List[float] = []
+        self._unresolved_ages: List[float] = []
+        self._unresolved_seen = 0
+        self._oldest: List[tuple] = []
+        self._random = random.Random(0)
+
+    def _sample(self, reservoir: List[float], seen: int, value: float) -> None:
+        # Reservoir sampling (algorithm R) keeps a uniform sample of fixed size
+        if len(reservoir) < self.sample_size:
+            reservoir.append(value)
+        else:
+            index = self._random.randrange(seen)
+            if index < self.sample_size:
+                reservoir[index] = value
+
+    def add(self, ticket: Dict[str, Any]) -> None:
+        self.total += 1
+
+        if self.group_by:
+            key = tuple(ticket.get(field) for field in self.group_by)
+            if key in self.groups:
+                self.groups[key] += 1
+            elif len(self.groups) < self.max_groups:
+                self.groups[key] = 1
+            else:
+                self.other_count += 1
+
+        created_at = _parse_time(ticket.get('created_at'))
+        if created_at is None:
+            return
+        age_hours = (self.now - created_at).total_seconds() / 3600
+        self._sample(self._ages, self.total, age_hours)
+
+        if ticket.get('status') in UNRESOLVED_STATUSES:
+            self.unresolved += 1
+            self._unresolved_seen += 1
+            self._sample(self._unresolved_ages, self._unresolved_seen, age_hours)
+
+            if self.oldest_limit > 0:
+                # Max-heap on created_at (via negated timestamp) keeps the N oldest
+                entry = (-created_at.timestamp(), self.total, {
+                    'id': ticket.get('id'),
+                    'subject': ticket.get('subject'),
+                    'status': ticket.get('status'),
+                    'priority': ticket.get('priority'),
+                    'assignee_id': ticket.get('assignee_id'),
+                    'created_at': ticket.get('created_at'),
+                    'age_hours': round(age_hours, 1)
+                })
+                if len(self._oldest) < self.oldest_limit:
+                    heapq.heappush(self._oldest, entry)
+                elif entry[0] > self._oldest[0][0]:
+                    heapq.heapreplace(self._oldest, entry)
+
+    @staticmethod
+    def _percentiles(values: List[float]) -> Dict[str, float] | None:
+        if not values:
+            return None
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        result = {f"p{p}": round(ordered[round(last * p / 100)], 1) for p in PERCENTILES}
+        result['max'] = round(ordered[-1], 1)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        groups = [
+            {**dict(zip(self.group_by, key)), 'count': count}
+            for key, count in sorted(self.groups.items(), key=lambda item: item[1], reverse=True)
+        ]
+        return {
+            'total': self.total,
+            'unresolved': self.unresolved,
+            'group_by': self.group_by,
+            'groups': groups,
+            'other_groups_count': self.other_count,
+            'age_hours': self._percentiles(self._ages),
+            'unresolved_age_hours': self._percentiles(self._unresolved_ages),
+            'oldest_unresolved': [entry[2] for entry in sorted(self._oldest, key=lambda entry: entry[0], reverse=True)],
+            'sampled': self.total > self.sample_size
+        }
@@ -0,0 +1,187 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, TypeVar
+import threading
+import time
+import urllib.parse
+
+from zendesk_mcp_server.metrics import metrics
+
+T = TypeVar('T')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of sending a request while the circuit of its endpoint family is open.
+    """
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(f"Zendesk {family} endpoints are failing, retrying in {retry_after:.0f}s")
+        self.family = family
+        self.retry_after = retry_after
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Group API URLs by their first path segment (tickets, users, search, help_center, ...).
+    """
+    path = urllib.parse.urlparse(url).path
+    if '/api/v2/' not in path:
+        return 'other'
+    return path.split('/api/v2/', 1)[1].split('/', 1)[0].split('.', 1)[0] or 'other'
+
+
+def _status_code(error: BaseException) -> int | None:
+    # urllib.error.HTTPError has .code, requests.HTTPError carries the response
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def is_failure_status(status: int) -> bool:
+    return status >= 500 or status == 429
+
+
+def is_throttled(error: BaseException) -> bool:
+    return _status_code(error) == 429
+
+
+def is_outage(error: BaseException | None) -> bool:
+    """
+    Whether an error means Zendesk is unavailable (open circuit, transport error,
+    5xx or 429) rather than the request itself being wrong.
+    """
+    # Client methods wrap upstream errors, so look through the exception chain
+    while error is not None:
+        status = _status_code(error)
+        if status is not None:
+            return is_failure_status(status)
+        if isinstance(error, OSError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint family.
+
+    The outcomes of the last window requests are tracked; errors and calls slower
+    than slow_call_seconds count as failures. Once at least min_calls outcomes are
+    known and the failure rate reaches failure_rate, the circuit opens and requests
+    fail fast for reset_timeout seconds. A single probe request is then let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        family: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        slow_call_seconds: float = 10,
+        reset_timeout: float = 30
+    ):
+        self.family = family
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: if the circuit is open, or half-open with a probe in flight
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == OPEN and retry_after <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        metrics.incr(f"circuit.{self.family}.rejected")
+        raise CircuitOpenError(self.family, max(retry_after, 0))
+
+    def record(self, ok: bool, elapsed: float = 0.0) -> None:
+        ok = ok and elapsed < self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if (
+                self.state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def run(
+        self,
+        send: Callable[[], T],
+        failed: Callable[[T], bool] | None = None,
+        expected: Callable[[Exception], bool] | None = None
+    ) -> T:
+        """
+        Run send() and record its outcome. failed(result) can flag results that did
+        not raise, such as a requests response with a 5xx status. expected(error)
+        can mark errors the caller handles as answers rather than failures, such as
+        a 429 it waits out.
+        """
+        started = time.monotonic()
+        try:
+            result = send()
+        except Exception as e:
+            self.record(not is_outage(e) or bool(expected and expected(e)), time.monotonic() - started)
+            raise
+        self.record(not (failed and failed(result)), time.monotonic() - started)
+        return result
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        metrics.incr(f"circuit.{self.family}.opened")
+
+
+class CircuitBreakers:
+    """
+    Lazily created circuit breakers keyed by endpoint family, sharing one set of thresholds.
+    """
+
+    def __init__(self, **settings: Any):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CircuitBreaker:
+        family = endpoint_family(url)
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(family, **self.settings)
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            return {family: breaker.state for family, breaker in self._breakers.items()}
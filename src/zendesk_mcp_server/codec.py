@@ -0,0 +1,43 @@
+from typing import Any
+import json
+
+# orjson is an optional speedup (pip install zendesk-mcp-server[fast]), the
+# standard library is used otherwise. Both backends parse bytes directly.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON document from bytes (preferred) or str.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Encode obj as a JSON string, optionally pretty-printed with two-space indentation.
+    """
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """
+    Encode obj as compact JSON bytes, for storage and wire formats.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode()
@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+import time
+
+# Timeout for a single upstream request when no tool deadline is set
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Absolute time.monotonic() by which the current tool call must finish
+_deadline: ContextVar[float | None] = ContextVar('zendesk_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every upstream request made in this context (including threads started
+    with asyncio.to_thread, which copy the context) to finish within seconds.
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def request_timeout(default: float = DEFAULT_REQUEST_TIMEOUT, at: float | None = None) -> float:
+    """
+    Timeout for the next upstream request: the time left until the deadline,
+    or default when no deadline is set.
+
+    Raises:
+        DeadlineExceeded: if the deadline has already passed
+    """
+    at = at if at is not None else _deadline.get()
+    if at is None:
+        return default
+    remaining = at - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the request could be sent")
+    return min(default, remaining)
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Tuple
+import threading
+
+from cachetools import TTLCache
+
+DIRECTORY_KINDS = ('users', 'organizations', 'groups')
+
+
+def compact_user(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': user.get('id'),
+        'name': user.get('name'),
+        'email': user.get('email'),
+        'role': user.get('role'),
+        'organization_id': user.get('organization_id')
+    }
+
+
+def compact_organization(organization: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': organization.get('id'),
+        'name': organization.get('name')
+    }
+
+
+def compact_group(group: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': group.get('id'),
+        'name': group.get('name')
+    }
+
+
+class DirectoryCache:
+    """
+    In-memory id -> record cache for users, organizations and groups.
+
+    Each kind is a TTLCache, so entries expire after ttl seconds and the least
+    recently used entries are evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 900):
+        self._caches = {kind: TTLCache(maxsize=maxsize, ttl=ttl) for kind in DIRECTORY_KINDS}
+        self._lock = threading.Lock()
+
+    def get_many(self, kind: str, ids: Iterable[int]) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+        """
+        Look up ids, returning the cached records and the deduplicated ids that were missing.
+        """
+        found: Dict[int, Dict[str, Any]] = {}
+        missing: List[int] = []
+        cache = self._caches[kind]
+        with self._lock:
+            for record_id in dict.fromkeys(i for i in ids if i is not None):
+                record = cache.get(record_id)
+                if record is None:
+                    missing.append(record_id)
+                else:
+                    found[record_id] = record
+        return found, missing
+
+    def put_many(self, kind: str, records: Iterable[Dict[str, Any]]) -> None:
+        cache = self._caches[kind]
+        with self._lock:
+            for record in records:
+                cache[record['id']] = record
+
+    def evict(self, kind: str, record_id: int) -> None:
+        with self._lock:
+            self._caches[kind].pop(record_id, None)
+
+
+class UserIndex:
+    """
+    In-memory email -> user and external_id -> user index of active users.
+
+    Records are upserted from user listings and the incremental users export;
+    a user's previous email or external_id mapping is dropped when it changes,
+    and users that became inactive are removed. Emails match case-insensitively.
+    Beyond max_users, the least recently upserted or found users are dropped.
+    """
+
+    def __init__(self, max_users: int = 100000):
+        self.max_users = max_users
+        # Least recently used first
+        self._by_id: OrderedDict[int, Dict[str, Any]] = OrderedDict()
+        self._by_email: Dict[str, int] = {}
+        self._by_external_id: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _unlink(self, user_id: int) -> None:
+        previous = self._by_id.pop(user_id, None)
+        if previous:
+            # Only drop mappings still pointing at this user
+            email = (previous.get('email') or '').lower()
+            if self._by_email.get(email) == user_id:
+                del self._by_email[email]
+            external_id = str(previous.get('external_id') or '')
+            if self._by_external_id.get(external_id) == user_id:
+                del self._by_external_id[external_id]
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                self._unlink(record['id'])
+                if record.get('active') is False:
+                    continue
+
+                self._by_id[record['id']] = record
+                if record.get('email'):
+                    self._by_email[record['email'].lower()] = record['id']
+                if record.get('external_id'):
+                    self._by_external_id[str(record['external_id'])] = record['id']
+                while len(self._by_id) > self.max_users:
+                    self._unlink(next(iter(self._by_id)))
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            self._unlink(user_id)
+
+    def _found(self, user_id: int | None) -> Dict[str, Any] | None:
+        if user_id is None:
+            return None
+        self._by_id.move_to_end(user_id)
+        return self._by_id[user_id]
+
+    def by_email(self, email: str) -> Dict[str, Any] | None:
+        with self._lock:
+            return self._found(self._by_email.get(email.lower()))
+
+    def by_external_id(self, external_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            return self._found(self._by_external_id.get(str(external_id)))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
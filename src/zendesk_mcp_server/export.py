@@ -0,0 +1,86 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable
+import gzip
+import os
+
+from zendesk_mcp_server import codec
+
+
+def parse_timestamp(value: int | float | str) -> int:
+    """
+    Convert a unix timestamp or an ISO 8601 date/datetime (UTC when no offset is given) to unix seconds.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+@dataclass
+class ExportCheckpoint:
+    """
+    Progress of an export, saved next to the output file after every page.
+
+    offset is the output file size once the page was written; anything past it
+    belongs to a page that was interrupted and is truncated on resume.
+    """
+
+    start_time: int
+    end_time: int | None
+    include_comments: bool
+    cursor: str | None = None
+    offset: int = 0
+    tickets: int = 0
+    comments: int = 0
+
+    @staticmethod
+    def path_for(output_path: str) -> str:
+        return f"{output_path}.checkpoint"
+
+    @classmethod
+    def load(cls, output_path: str) -> 'ExportCheckpoint | None':
+        try:
+            with open(cls.path_for(output_path), 'rb') as f:
+                return cls(**codec.loads(f.read()))
+        except FileNotFoundError:
+            return None
+
+    def matches(self, start_time: int, end_time: int | None, include_comments: bool) -> bool:
+        return (self.start_time, self.end_time, self.include_comments) == (start_time, end_time, include_comments)
+
+    def save(self, output_path: str) -> None:
+        # Written to a temporary file first so a crash never leaves a truncated checkpoint
+        path = self.path_for(output_path)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(codec.dumpb(asdict(self)))
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def remove(cls, output_path: str) -> None:
+        try:
+            os.remove(cls.path_for(output_path))
+        except FileNotFoundError:
+            pass
+
+
+def append_ndjson(path: str, records: Iterable[Dict[str, Any]], compress: bool) -> int:
+    """
+    Append records as NDJSON and return the new file size. Compressed output gets
+    one gzip member per call, so the file stays readable at every checkpoint offset.
+    """
+    lines = b''.join(codec.dumpb(record) + b'\n' for record in records)
+    if not lines:
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    if compress:
+        lines = gzip.compress(lines)
+    with open(path, 'ab') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
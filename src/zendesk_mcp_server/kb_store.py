@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List
+import sys
+import threading
+import zlib
+
+from zendesk_mcp_server import codec
+
+# zlib level for article bodies, HTML compresses 4-6x at this level
+COMPRESSION_LEVEL = 6
+
+# Rough per-article overhead of the slotted record and its small fields
+ARTICLE_OVERHEAD = 200
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Section:
+    __slots__ = ('id', 'name', 'description')
+
+    def __init__(self, section_id: int | None, name: str | None, description: str | None):
+        self.id = section_id
+        self.name = _intern(name)
+        self.description = _intern(description)
+
+
+class Article:
+    """
+    Help center article with its body kept zlib-compressed. body is None once
+    the compressed body was evicted to stay within the store budget.
+    """
+
+    __slots__ = ('id', 'title', 'updated_at', 'url', 'section', 'body')
+
+    def __init__(self, record: Dict[str, Any], section: Section):
+        self.id = record.get('id')
+        self.title = record.get('title')
+        self.updated_at = _intern(record.get('updated_at'))
+        self.url = record.get('url')
+        self.section = section
+        self.body: bytes | None = zlib.compress((record.get('body') or '').encode(), COMPRESSION_LEVEL)
+
+    @property
+    def size(self) -> int:
+        return ARTICLE_OVERHEAD + len(self.body or b'') + len(self.title or '') + len(self.url or '')
+
+
+class KnowledgeBaseStore:
+    """
+    Compact in-memory knowledge base.
+
+    Sections are stored once and shared by their articles, article records use
+    __slots__ and keep their bodies compressed until they are read. When the
+    stored size exceeds max_bytes, bodies of the least recently read articles are
+    evicted. Single-article reads (body, article) reload an evicted body through
+    load_body(article_id) when one is given; bulk reads (iter_json) never reload
+    and mark evicted articles with body None and body_evicted True.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, load_body: Callable[[int], str | None] | None = None):
+        self.max_bytes = max_bytes
+        self.load_body = load_body
+        self.sections: List[Section] = []
+        # Least recently read first
+        self._articles: OrderedDict[int, Article] = OrderedDict()
+        self._by_section: Dict[int, List[Article]] = {}
+        self.size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, kb: Dict[str, Any], **kwargs: Any) -> 'KnowledgeBaseStore':
+        """
+        Build a store from the section name -> {section_id, description, articles} dict
+        returned by ZendeskClient.get_all_articles.
+        """
+        store = cls(**kwargs)
+        for name, section in kb.items():
+            store.add_section(name, section.get('section_id'), section.get('description'), section.get('articles', []))
+        return store
+
+    def add_section(
+        self,
+        name: str | None,
+        section_id: int | None,
+        description: str | None,
+        articles: List[Dict[str, Any]]
+    ) -> None:
+        section = Section(section_id, name, description)
+        records = [Article(article, section) for article in articles]
+        with self._lock:
+            self.sections.append(section)
+            self._by_section[id(section)] = records
+            for article in records:
+                self._articles[article.id] = article
+                self.size += article.size
+            self._evict()
+
+    def _evict(self) -> None:
+        for article in self._articles.values():
+            if self.size <= self.max_bytes:
+                return
+            if article.body is not None:
+                self.size -= len(article.body)
+                article.body = None
+
+    def body(self, article_id: int) -> str | None:
+        """
+        Decompressed body of an article, reloading it when it was evicted.
+        """
+        with self._lock:
+            article = self._articles.get(article_id)
+            if article is None:
+                return None
+            self._articles.move_to_end(article_id)
+            compressed = article.body
+        if compressed is not None:
+            return zlib.decompress(compressed).decode()
+        if self.load_body is None:
+            return None
+
+        body = self.load_body(article_id) or ''
+        with self._lock:
+            if article.body is None:
+                article.body = zlib.compress(body.encode(), COMPRESSION_LEVEL)
+                self.size += len(article.body)
+                self._evict()
+        return body
+
+    def article(self, article_id: int) -> Dict[str, Any] | None:
+        """
+        A single article with its section, reloading its body when it was evicted.
+        """
+        body = self.body(article_id)
+        with self._lock:
+            article = self._articles.get(article_id)
+        if article is None:
+            return None
+        return {
+            'id': article.id,
+            'title': article.title,
+            'body': body,
+            'updated_at': article.updated_at,
+            'url': article.url,
+            'section': {'id': article.section.id, 'name': article.section.name}
+        }
+
+    def _article_dict(self, article: Article) -> Dict[str, Any]:
+        # Bulk reads neither reload evicted bodies nor count as recent use
+        compressed = article.body
+        record = {
+            'id': article.id,
+            'title': article.title,
+            'body': zlib.decompress(compressed).decode() if compressed is not None else None,
+            'updated_at': article.updated_at,
+            'url': article.url
+        }
+        if compressed is None:
+            record['body_evicted'] = True
+        return record
+
+    def iter_sections(self) -> Iterator[tuple]:
+        """
+        Yield (section, articles) pairs in insertion order.
+        """
+        with self._lock:
+            sections = [(section, list(self._by_section[id(section)])) for section in self.sections]
+        yield from sections
+
+    def iter_json(self) -> Iterator[str]:
+        """
+        Encode the store in the get_all_articles dict shape as compact JSON chunks,
+        one article at a time, without building the expanded dict first.
+        """
+        yield '{'
+        for index, (section, articles) in enumerate(self.iter_sections()):
+            header = codec.dumps({'section_id': section.id, 'description': section.description})
+            yield f'{"," if index else ""}{codec.dumps(section.name or "")}:{header[:-1]},"articles":['
+            for position, article in enumerate(articles):
+                yield f'{"," if position else ""}{codec.dumps(self._article_dict(article))}'
+            yield ']}'
+        yield '}'
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'sections': len(self.sections),
+                'articles': len(self._articles),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'evicted_bodies': sum(1 for article in self._articles.values() if article.body is None)
+            }
@@ -0,0 +1,187 @@
+from typing import Any, Dict, Iterable, List
+import re
+import threading
+import time
+
+from zendesk_mcp_server.directory import compact_group, compact_organization
+
+METADATA_KINDS = ('groups', 'organizations', 'ticket_fields')
+
+# Allowed values listed in a validation error before it is cut short
+MAX_LISTED_OPTIONS = 20
+
+DATE_VALUE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def compact_ticket_field(field: Dict[str, Any]) -> Dict[str, Any]:
+    options = field.get('custom_field_options') or field.get('system_field_options') or []
+    return {
+        'id': field.get('id'),
+        'name': field.get('title'),
+        'type': field.get('type'),
+        'active': field.get('active', True),
+        'required': field.get('required', False),
+        'regexp_for_validation': field.get('regexp_for_validation'),
+        'options': [{'name': option.get('name'), 'value': option.get('value')} for option in options]
+    }
+
+
+COMPACT = {
+    'groups': compact_group,
+    'organizations': compact_organization,
+    'ticket_fields': compact_ticket_field,
+}
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, str) and value.lstrip('-').isdigit())
+
+
+def _is_decimal(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class MetadataCache:
+    """
+    Groups, organizations and ticket fields (with their options) of the account,
+    replaced as a whole on every refresh. Names resolve to ids case-insensitively,
+    and custom field values are checked against the field definitions locally.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Dict[int, Dict[str, Any]]] = {kind: {} for kind in METADATA_KINDS}
+        self._by_name: Dict[str, Dict[str, List[Dict[str, Any]]]] = {kind: {} for kind in METADATA_KINDS}
+        self.loaded_at: Dict[str, float] = {}
+        # Kinds with more records than were loaded, so a miss is not conclusive
+        self.truncated: set = set()
+        self._lock = threading.Lock()
+
+    def replace(self, kind: str, records: Iterable[Dict[str, Any]], truncated: bool = False) -> List[Dict[str, Any]]:
+        """
+        Replace every record of a kind with the compacted form of raw API records.
+        """
+        compacted = [COMPACT[kind](record) for record in records]
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for record in compacted:
+            by_name.setdefault((record.get('name') or '').strip().lower(), []).append(record)
+        with self._lock:
+            self._records[kind] = {record['id']: record for record in compacted}
+            self._by_name[kind] = by_name
+            self.loaded_at[kind] = time.time()
+            if truncated:
+                self.truncated.add(kind)
+            else:
+                self.truncated.discard(kind)
+        return compacted
+
+    def loaded(self, kind: str) -> bool:
+        return kind in self.loaded_at
+
+    def get(self, kind: str, record_id: int) -> Dict[str, Any] | None:
+        with self._lock:
+            return self._records[kind].get(record_id)
+
+    def all(self, kind: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records[kind].values())
+
+    def resolve(self, kind: str, name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Records whose name equals name, ignoring case, or failing that, contains it.
+        """
+        key = name.strip().lower()
+        with self._lock:
+            exact = self._by_name[kind].get(key)
+            if exact:
+                return exact[:limit]
+            return [
+                record for record_name, records in self._by_name[kind].items() if key in record_name
+                for record in records
+            ][:limit]
+
+    def validate_custom_fields(self, custom_fields: List[Dict[str, Any]]) -> List[str]:
+        """
+        Check custom field values against the cached ticket fields and return one
+        message per problem. Fields missing from the cache are reported as unknown.
+        """
+        errors = []
+        for custom_field in custom_fields:
+            if not isinstance(custom_field, dict) or 'id' not in custom_field:
+                errors.append(f"custom field entries need an id and a value, got {custom_field!r}")
+                continue
+            field = self.get('ticket_fields', custom_field['id'])
+            if field is None:
+                errors.append(f"unknown ticket field {custom_field['id']}")
+                continue
+            error = self._check_value(field, custom_field.get('value'))
+            if error:
+                errors.append(f"ticket field {field['id']} ({field['name']}): {error}")
+        return errors
+
+    @staticmethod
+    def _check_value(field: Dict[str, Any], value: Any) -> str | None:
+        if not field['active']:
+            return "field is inactive"
+        # Clearing a field is always allowed
+        if value is None or value == '' or value == []:
+            return None
+
+        field_type = field['type']
+        allowed = [option['value'] for option in field['options']]
+        if field_type in ('tagger', 'priority', 'tickettype', 'status') and allowed:
+            chosen = [value]
+        elif field_type == 'multiselect':
+            if not isinstance(value, list):
+                return "expected a list of option values"
+            chosen = value
+        else:
+            chosen = None
+
+        if chosen is not None:
+            invalid = [choice for choice in chosen if choice not in allowed]
+            if invalid:
+                listed = ', '.join(str(option) for option in allowed[:MAX_LISTED_OPTIONS])
+                more = f" and {len(allowed) - MAX_LISTED_OPTIONS} more" if len(allowed) > MAX_LISTED_OPTIONS else ''
+                return f"invalid option {', '.join(map(str, invalid))}; allowed values: {listed}{more}"
+            return None
+
+        if field_type == 'checkbox' and not isinstance(value, bool):
+            return "expected true or false"
+        if field_type in ('integer', 'lookup') and not _is_integer(value):
+            return "expected an integer"
+        if field_type == 'decimal' and not _is_decimal(value):
+            return "expected a number"
+        if field_type == 'date' and not (isinstance(value, str) and DATE_VALUE.match(value)):
+            return "expected a date as YYYY-MM-DD"
+        if field_type in ('text', 'textarea', 'regexp', 'partialcreditcard') and not isinstance(value, str):
+            return "expected a string"
+        if field_type == 'regexp' and field.get('regexp_for_validation'):
+            # Zendesk patterns are Ruby regular expressions, \z is Python's \Z
+            try:
+                matched = re.search(field['regexp_for_validation'].replace('\\z', '\\Z'), value)
+            except re.error:
+                return None
+            if not matched:
+                return f"does not match {field['regexp_for_validation']}"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                kind: {
+                    'records': len(self._records[kind]),
+                    'loaded_at': self.loaded_at.get(kind),
+                    'truncated': kind in self.truncated
+                }
+                for kind in METADATA_KINDS
+            }
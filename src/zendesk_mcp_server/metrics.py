@@ -0,0 +1,53 @@
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict
+import threading
+
+# Number of recent latency samples kept per endpoint family
+LATENCY_WINDOW = 200
+
+
+class Metrics:
+    """
+    Thread-safe in-process counters and upstream latency windows, exposed
+    through the zendesk://server-metrics resource.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def record_latency(self, family: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies[family].append(seconds)
+
+    def latency_percentile(self, family: str, percentile: float, min_samples: int = 20) -> float | None:
+        """
+        Recent latency percentile of an endpoint family, or None until enough samples exist.
+        """
+        with self._lock:
+            samples = sorted(self._latencies[family])
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            families = {family: sorted(samples) for family, samples in self._latencies.items()}
+        latencies = {}
+        for family, samples in families.items():
+            if samples:
+                latencies[family] = {
+                    'samples': len(samples),
+                    'p50_ms': round(samples[len(samples) // 2] * 1000, 1),
+                    'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+                }
+        return {'counters': counters, 'upstream_latency': latencies}
+
+
+metrics = Metrics()
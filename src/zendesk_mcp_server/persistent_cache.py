@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+import os
+import sqlite3
+import threading
+import time
+
+from zendesk_mcp_server import codec
+
+# Only bump accessed_at when it is older than this, so reads rarely need a write lock
+ACCESS_RESOLUTION = 60
+
+# Re-check the total size after this many writes
+EVICTION_CHECK_INTERVAL = 64
+
+# Most recent invalidations kept for processes that have not caught up yet
+INVALIDATION_LOG_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    etag TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS invalidations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    record_id INTEGER,
+    published_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: str | None
+    stored_at: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache shared by all server processes on a host.
+
+    The database runs in WAL mode so concurrent processes can read while one
+    writes. Entries carry TTL metadata and an optional ETag; expired entries are
+    kept (for revalidation and stale fallback) until they are overwritten or
+    evicted. When the stored size exceeds max_bytes, the least recently
+    accessed entries are evicted.
+
+    Invalidations are appended to a shared log, so each process can drop the
+    copies it keeps in memory when another process learns that a record changed.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._evict()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> CacheEntry | None:
+        """
+        Return the entry stored under key, including expired ones (check entry.expired).
+        """
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, etag, stored_at, expires_at, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, str(key))
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[4] > ACCESS_RESOLUTION:
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, str(key))
+            )
+        return CacheEntry(value=codec.loads(row[0]), etag=row[1], stored_at=row[2], expires_at=row[3])
+
+    def get_many(self, namespace: str, keys: Iterable[Any]) -> Dict[str, CacheEntry]:
+        """
+        Return unexpired entries for the given keys, keyed by their string form.
+        """
+        keys = [str(key) for key in keys]
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        rows = self._conn().execute(
+            f"SELECT key, value, etag, stored_at, expires_at FROM entries "
+            f"WHERE namespace = ? AND expires_at > ? AND key IN ({placeholders})",
+            (namespace, time.time(), *keys)
+        ).fetchall()
+        return {
+            row[0]: CacheEntry(value=codec.loads(row[1]), etag=row[2], stored_at=row[3], expires_at=row[4])
+            for row in rows
+        }
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: float, etag: str | None = None) -> None:
+        self.set_many(namespace, {key: value}, ttl, etag)
+
+    def set_many(self, namespace: str, items: Dict[Any, Any], ttl: float, etag: str | None = None) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            blob = codec.dumpb(value)
+            rows.append((namespace, str(key), blob, etag, now, now + ttl, now, len(blob)))
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, key, value, etag, stored_at, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._writes_lock:
+            self._writes += len(rows)
+            check = self._writes >= EVICTION_CHECK_INTERVAL
+            if check:
+                self._writes = 0
+        if check:
+            self._evict()
+
+    def delete(self, namespace: str, key: Any) -> None:
+        self._conn().execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, str(key)))
+
+    def publish_invalidation(self, kind: str, record_id: int | None) -> None:
+        """
+        Append an invalidation of a record (or of a whole kind when record_id is None) to the log.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute(
+                "INSERT INTO invalidations (origin, kind, record_id, published_at) VALUES (?, ?, ?, ?)",
+                (os.getpid(), kind, record_id, time.time())
+            ).lastrowid
+            conn.execute("DELETE FROM invalidations WHERE seq <= ?", (seq - INVALIDATION_LOG_SIZE,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def last_invalidation(self) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM invalidations").fetchone()[0]
+
+    def invalidations_since(self, seq: int) -> Tuple[int, List[Tuple[str, int | None]], bool]:
+        """
+        Return the last sequence number, the (kind, record_id) invalidations other
+        processes published after seq, and whether some were pruned before being read.
+        """
+        rows = self._conn().execute(
+            "SELECT seq, origin, kind, record_id FROM invalidations WHERE seq > ? ORDER BY seq", (seq,)
+        ).fetchall()
+        if not rows:
+            return seq, [], False
+        missed = rows[0][0] > seq + 1
+        origin = os.getpid()
+        return rows[-1][0], [(row[2], row[3]) for row in rows if row[1] != origin], missed
+
+    def _evict(self) -> None:
+        """
+        Evict least recently accessed entries until the cache is below 90% of max_bytes.
+        """
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - int(self.max_bytes * 0.9)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            freed = 0
+            victims = []
+            for namespace, key, size in conn.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY accessed_at"
+            ):
+                victims.append((namespace, key))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+import logging
+import threading
+
+from cachetools import TTLCache
+
+from zendesk_mcp_server.metrics import metrics
+from zendesk_mcp_server.ratelimit import RateLimiter
+
+logger = logging.getLogger("zendesk-mcp-server")
+
+# Speculation for a kind is judged only after this many prefetches
+WARMUP_PREFETCHES = 20
+
+# While a kind's hit rate is below the minimum, still speculate on one in this many
+# opportunities so a change in usage can bring the hit rate back up
+EXPLORE_EVERY = 10
+
+
+class Prefetcher:
+    """
+    Speculative background reads kept in a short-lived in-memory cache.
+
+    Each prefetched value is served at most once: take() pops it and counts a hit,
+    values never taken expire after ttl seconds. Prefetches only run while at least
+    reserve of the rate limiter burst is available, so speculation never delays
+    real requests. Once a kind has a hit rate below min_hit_rate, it is mostly
+    skipped.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        ttl: float = 60,
+        maxsize: int = 256,
+        reserve: float = 0.5,
+        min_hit_rate: float = 0.2,
+        workers: int = 2
+    ):
+        self.rate_limiter = rate_limiter
+        self.reserve = reserve
+        self.min_hit_rate = min_hit_rate
+        self._results: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: set = set()
+        self._issued: Dict[str, int] = defaultdict(int)
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._opportunities: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zendesk-prefetch")
+
+    def _worthwhile(self, kind: str) -> bool:
+        issued = self._issued[kind]
+        if issued < WARMUP_PREFETCHES or self._hits[kind] / issued >= self.min_hit_rate:
+            return True
+        self._opportunities[kind] += 1
+        return self._opportunities[kind] % EXPLORE_EVERY == 0
+
+    def schedule(self, kind: str, key: Hashable, fetch: Callable[[], Any]) -> None:
+        """
+        Fetch a value in the background unless it is already cached or being fetched.
+        """
+        with self._lock:
+            if (kind, key) in self._results or (kind, key) in self._inflight:
+                return
+            if not self._worthwhile(kind):
+                metrics.incr(f"prefetch.{kind}.skipped")
+                return
+            self._inflight.add((kind, key))
+        self._pool.submit(self._run, kind, key, fetch)
+
+    def _run(self, kind: str, key: Hashable, fetch: Callable[[], Any]) -> None:
+        try:
+            if self.rate_limiter.available() < self.rate_limiter.burst * self.reserve:
+                metrics.incr(f"prefetch.{kind}.skipped")
+                return
+            value = fetch()
+            with self._lock:
+                self._results[(kind, key)] = value
+                self._issued[kind] += 1
+            metrics.incr(f"prefetch.{kind}.issued")
+        except Exception as e:
+            logger.debug(f"Prefetch of {kind} {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard((kind, key))
+
+    def take(self, kind: str, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._results.pop((kind, key), None)
+            if value is not None:
+                self._hits[kind] += 1
+        if value is not None:
+            metrics.incr(f"prefetch.{kind}.hits")
+        return value
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            self._results.pop((kind, key), None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                kind: {
+                    'issued': issued,
+                    'hits': self._hits[kind],
+                    'hit_rate': round(self._hits[kind] / issued, 3) if issued else None
+                }
+                for kind, issued in self._issued.items()
+            }
@@ -0,0 +1,80 @@
+from typing import Any
+import threading
+import time
+
+import requests
+
+from zendesk_mcp_server.circuit import CircuitBreakers, is_failure_status
+from zendesk_mcp_server.deadlines import request_timeout
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every upstream Zendesk request.
+
+    Tokens refill continuously at rate_per_minute; up to burst requests may be
+    issued back to back before callers start waiting.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst or max(1, int(self.rate * 10))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        """
+        Number of requests that can be issued right now without waiting.
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until it is available. Returns the seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimitedSession(requests.Session):
+    """
+    requests session that takes a rate limiter token before every request, so
+    zenpy calls share the budget with direct API calls, and bounds each request
+    by the current tool deadline. With breakers, requests to a failing endpoint
+    family fail fast instead of waiting for a timeout.
+    """
+
+    def __init__(self, limiter: RateLimiter, breakers: CircuitBreakers | None = None):
+        super().__init__()
+        self.limiter = limiter
+        self.breakers = breakers
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        kwargs['timeout'] = request_timeout()
+        if self.breakers is None:
+            self.limiter.acquire()
+            return super().send(request, **kwargs)
+
+        breaker = self.breakers.get(request.url)
+        breaker.before_request()
+        self.limiter.acquire()
+        return breaker.run(
+            lambda: super(RateLimitedSession, self).send(request, **kwargs),
+            failed=lambda response: is_failure_status(response.status_code)
+        )
@@ -0,0 +1,118 @@
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List
+import asyncio
+import itertools
+import time
+
+from zendesk_mcp_server.metrics import metrics
+
+# Priority classes, lower runs first
+INTERACTIVE = 0
+WRITE = 1
+BULK = 2
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', WRITE: 'write', BULK: 'bulk'}
+
+# Number of recent queue waits kept per priority class
+WAIT_WINDOW = 200
+
+
+class ToolScheduler:
+    """
+    Admission control for tool calls on the event loop.
+
+    At most max_concurrency calls run at once, and at most tool_limits[name] of
+    a given tool. Calls that cannot start wait in a queue ordered by priority
+    class, then arrival. A waiting call blocked only by its own tool limit does
+    not hold back calls of other tools behind it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        tool_limits: Dict[str, int] | None = None,
+        priorities: Dict[str, int] | None = None,
+        default_priority: int = INTERACTIVE
+    ):
+        self.max_concurrency = max_concurrency
+        self.tool_limits = tool_limits or {}
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self._running: Dict[str, int] = defaultdict(int)
+        self._total = 0
+        self._waiters: List[list] = []
+        self._sequence = itertools.count()
+        self._max_depth: Dict[int, int] = defaultdict(int)
+        self._waits: Dict[int, Deque[float]] = defaultdict(lambda: deque(maxlen=WAIT_WINDOW))
+
+    def priority(self, name: str) -> int:
+        return self.priorities.get(name, self.default_priority)
+
+    def _can_start(self, name: str) -> bool:
+        limit = self.tool_limits.get(name)
+        return self._total < self.max_concurrency and (limit is None or self._running[name] < limit)
+
+    def _dispatch(self) -> None:
+        self._waiters = [entry for entry in self._waiters if not entry[3].done()]
+        for entry in sorted(self._waiters):
+            if self._total >= self.max_concurrency:
+                break
+            name, future = entry[2], entry[3]
+            if self._can_start(name):
+                self._running[name] += 1
+                self._total += 1
+                future.set_result(None)
+        self._waiters = [entry for entry in self._waiters if not entry[3].done()]
+
+    def _release(self, name: str) -> None:
+        self._running[name] -= 1
+        self._total -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[None]:
+        """
+        Wait for a slot to run tool name, holding it for the duration of the block.
+        """
+        priority = self.priority(name)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append([priority, next(self._sequence), name, future])
+        queued_at = time.monotonic()
+        self._dispatch()
+        if not future.done():
+            metrics.incr(f"scheduler.{PRIORITY_NAMES.get(priority, priority)}.queued")
+            depth = sum(1 for entry in self._waiters if entry[0] == priority)
+            self._max_depth[priority] = max(self._max_depth[priority], depth)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Cancelled right after being granted a slot: hand it on
+            if future.done() and not future.cancelled():
+                self._release(name)
+            else:
+                self._dispatch()
+            raise
+        self._waits[priority].append(time.monotonic() - queued_at)
+
+        try:
+            yield
+        finally:
+            self._release(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Running and queued calls per priority class, the deepest queue seen and recent waits.
+        """
+        stats = {}
+        for priority, label in PRIORITY_NAMES.items():
+            waits = sorted(self._waits[priority])
+            stats[label] = {
+                'running': sum(count for name, count in self._running.items() if self.priority(name) == priority),
+                'queued': sum(1 for entry in self._waiters if entry[0] == priority and not entry[3].done()),
+                'max_queued': self._max_depth[priority],
+                'wait_p50_ms': round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+                'wait_p95_ms': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else None,
+            }
+        return stats
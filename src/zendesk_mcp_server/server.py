@@ -1,7 +1,7 @@
 import asyncio
-import json
 import logging
 import os
+import time
 from typing import Any, Dict
 
 from cachetools.func import ttl_cache
@@ -11,7 +11,15 @@ from mcp.server import Server, types
 from mcp.server.stdio import stdio_server
 from pydantic import AnyUrl
 
-from zendesk_mcp_server.zendesk_client import ZendeskClient
+from zendesk_mcp_server import codec
+from zendesk_mcp_server.circuit import is_outage
+from zendesk_mcp_server.deadlines import deadline
+from zendesk_mcp_server.kb_store import KnowledgeBaseStore
+from zendesk_mcp_server.metrics import metrics
+from zendesk_mcp_server.persistent_cache import PersistentCache
+from zendesk_mcp_server.scheduler import BULK, INTERACTIVE, WRITE, ToolScheduler
+from zendesk_mcp_server.webhook import WebhookListener
+from zendesk_mcp_server.zendesk_client import JOB_TIMEOUT, ZendeskClient
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,14 +30,129 @@ logger = logging.getLogger("zendesk-mcp-server")
 logger.info("zendesk mcp server started")
 
 load_dotenv()
+
+KB_CACHE_TTL = 3600
+
+# Memory budget of the in-process knowledge base, bodies beyond it are dropped
+KB_MAX_BYTES = int(os.getenv("ZENDESK_KB_MAX_MB", "64")) * 1024 * 1024
+
+# Optional on-disk cache shared by every server process on this host
+persistent_cache = None
+if os.getenv("ZENDESK_CACHE_PATH"):
+    persistent_cache = PersistentCache(
+        path=os.getenv("ZENDESK_CACHE_PATH"),
+        max_bytes=int(os.getenv("ZENDESK_CACHE_MAX_MB", "256")) * 1024 * 1024
+    )
+
+# Seconds update_ticket calls are held back to be merged, 0 writes them immediately
+WRITE_COALESCE_SECONDS = float(os.getenv("ZENDESK_WRITE_COALESCE_SECONDS", "0"))
+
 zendesk_client = ZendeskClient(
     subdomain=os.getenv("ZENDESK_SUBDOMAIN"),
     email=os.getenv("ZENDESK_EMAIL"),
-    token=os.getenv("ZENDESK_API_KEY")
+    token=os.getenv("ZENDESK_API_KEY"),
+    cache=persistent_cache,
+    ticket_cache_ttl=float(os.getenv("ZENDESK_TICKET_CACHE_TTL", "60")),
+    native=os.getenv("ZENDESK_BACKEND", "zenpy").lower() == "native",
+    rate_limit=float(os.getenv("ZENDESK_RATE_LIMIT", "400")),
+    attachment_max_bytes=int(os.getenv("ZENDESK_ATTACHMENT_MAX_MB", "50")) * 1024 * 1024,
+    attachment_inline_max_bytes=int(os.getenv("ZENDESK_ATTACHMENT_INLINE_KB", "256")) * 1024,
+    hedge=os.getenv("ZENDESK_HEDGE_REQUESTS", "false").lower() == "true",
+    breaker_settings={
+        "failure_rate": float(os.getenv("ZENDESK_BREAKER_FAILURE_RATE", "0.5")),
+        "slow_call_seconds": float(os.getenv("ZENDESK_BREAKER_SLOW_SECONDS", "10")),
+        "reset_timeout": float(os.getenv("ZENDESK_BREAKER_RESET_SECONDS", "30")),
+    },
+    write_coalesce_window=WRITE_COALESCE_SECONDS,
+    prefetch=os.getenv("ZENDESK_PREFETCH", "false").lower() == "true",
+    prefetch_comments=int(os.getenv("ZENDESK_PREFETCH_COMMENTS", "3")),
+    user_index=os.getenv("ZENDESK_USER_INDEX", "false").lower() == "true",
+    user_index_refresh=float(os.getenv("ZENDESK_USER_INDEX_REFRESH", "300")),
+    metadata_refresh=float(os.getenv("ZENDESK_METADATA_REFRESH", "600")),
+    similarity_max_tickets=int(os.getenv("ZENDESK_SIMILARITY_MAX_TICKETS", "20000"))
 )
 
 server = Server("Zendesk Server")
 
+# Read-only tools that can be combined in a single batch call
+BATCH_TOOLS = {
+    "get_ticket", "get_tickets", "search_tickets", "count_tickets", "count_search",
+    "get_ticket_comments", "get_attachment", "list_users", "search_users",
+    "resolve_names", "get_ticket_changes", "find_similar_tickets",
+}
+MAX_BATCH_OPERATIONS = 50
+BATCH_CONCURRENCY = 8
+
+# Seconds a tool call may take, including every upstream request it makes.
+# Overrides come from ZENDESK_TOOL_TIMEOUTS, e.g. "aggregate_tickets=600,get_ticket=10"
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("ZENDESK_TOOL_TIMEOUT", "30"))
+TOOL_TIMEOUTS = {
+    "aggregate_tickets": 300.0,
+    "export_tickets": 900.0,
+    "get_attachment": 120.0,
+    "batch": 60.0,
+}
+# A coalesced update waits for the merge window, then possibly for an update_many job
+if WRITE_COALESCE_SECONDS > 0:
+    TOOL_TIMEOUTS["update_ticket"] = WRITE_COALESCE_SECONDS + JOB_TIMEOUT + DEFAULT_TOOL_TIMEOUT
+
+
+def parse_tool_settings(value: str | None, cast: type) -> Dict[str, Any]:
+    """Parse "tool=value,tool=value" overrides from an environment variable"""
+    settings = {}
+    for override in filter(None, (value or "").split(",")):
+        tool_name, _, setting = override.partition("=")
+        settings[tool_name.strip()] = cast(setting)
+    return settings
+
+
+TOOL_TIMEOUTS.update(parse_tool_settings(os.getenv("ZENDESK_TOOL_TIMEOUTS"), float))
+
+
+def tool_timeout(name: str, arguments: dict[str, Any] | None) -> float:
+    """Deadline of a tool call; a batch gets at least the longest deadline of its operations"""
+    timeout = TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT)
+    if name == "batch" and arguments and isinstance(arguments.get("operations"), list):
+        timeout = max([timeout] + [
+            TOOL_TIMEOUTS.get(operation.get("tool"), DEFAULT_TOOL_TIMEOUT)
+            for operation in arguments["operations"]
+            if isinstance(operation, dict) and operation.get("tool") in BATCH_TOOLS
+        ])
+    return timeout
+
+# Tool calls are admitted by priority class: interactive reads first, then
+# writes, then bulk work. Tools not listed are interactive.
+TOOL_PRIORITIES = {
+    "create_ticket": WRITE,
+    "update_ticket": WRITE,
+    "create_ticket_comment": WRITE,
+    "aggregate_tickets": BULK,
+    "export_tickets": BULK,
+}
+
+# Calls running at once per tool, overridden with ZENDESK_TOOL_CONCURRENCY, e.g. "export_tickets=2"
+TOOL_CONCURRENCY = {
+    "aggregate_tickets": 2,
+    "export_tickets": 1,
+}
+TOOL_CONCURRENCY.update(parse_tool_settings(os.getenv("ZENDESK_TOOL_CONCURRENCY"), int))
+
+scheduler = ToolScheduler(
+    max_concurrency=int(os.getenv("ZENDESK_MAX_CONCURRENCY", "16")),
+    tool_limits=TOOL_CONCURRENCY,
+    priorities=TOOL_PRIORITIES,
+    default_priority=INTERACTIVE
+)
+
+# Upper bound on the size of ticket data embedded in prompts
+PROMPT_DATA_MAX_CHARS = 60000
+
+# Tools whose JSON results are returned indented
+PRETTY_PRINTED_TOOLS = {
+    "create_ticket", "get_tickets", "get_ticket_changes", "find_similar_tickets", "search_tickets", "aggregate_tickets",
+    "export_tickets", "update_ticket", "list_users", "search_users", "resolve_names",
+}
+
 TICKET_ANALYSIS_TEMPLATE = """
 You are a helpful Zendesk support analyst. You've been asked to analyze ticket #{ticket_id}.
 
@@ -54,6 +177,10 @@ Please fetch the ticket info, comments and knowledge base to draft a professiona
 The response should be formatted well and ready to be posted as a comment.
 """
 
+PREFETCHED_DATA_NOTE = """
+The ticket and its comments are attached below, there is no need to fetch them again.
+"""
+
 
 @server.list_prompts()
 async def handle_list_prompts() -> list[types.Prompt]:
@@ -67,6 +194,11 @@ async def handle_list_prompts() -> list[types.Prompt]:
                     name="ticket_id",
                     description="The ID of the ticket to analyze",
                     required=True,
+                ),
+                types.PromptArgument(
+                    name="include_data",
+                    description="Set to 'true' to attach the ticket and its comments to the prompt",
+                    required=False,
                 )
             ],
         ),
@@ -78,12 +210,71 @@ async def handle_list_prompts() -> list[types.Prompt]:
                     name="ticket_id",
                     description="The ID of the ticket to respond to",
                     required=True,
+                ),
+                types.PromptArgument(
+                    name="include_data",
+                    description="Set to 'true' to attach the ticket and its comments to the prompt",
+                    required=False,
                 )
             ],
         )
     ]
 
 
+async def prefetch_ticket_resources(ticket_id: int) -> list[types.EmbeddedResource]:
+    """Fetch a ticket and its comments concurrently as embedded prompt resources"""
+    ticket, comments = await asyncio.gather(
+        asyncio.to_thread(zendesk_client.get_ticket, ticket_id),
+        asyncio.to_thread(zendesk_client.get_ticket_comments, ticket_id),
+    )
+    ticket_text = codec.dumps(ticket)
+
+    # Cut a long description so the ticket takes about half the budget at most, leaving room for comments
+    excess = len(ticket_text) - PROMPT_DATA_MAX_CHARS // 2
+    description = ticket.get("description") or ""
+    if excess > 0 and description:
+        # Escaped characters take more room in JSON, so cut in proportion to the encoded length
+        encoded = len(codec.dumps(description))
+        keep = len(description) * max(0, encoded - excess) // encoded
+        ticket = {**ticket, "description": description[:keep], "description_truncated": True}
+        ticket_text = codec.dumps(ticket)
+
+    # Keep the most recent comments that fit in the remaining budget
+    budget = PROMPT_DATA_MAX_CHARS - len(ticket_text)
+    kept = []
+    for comment in reversed(comments):
+        compact = {k: v for k, v in comment.items() if k != "html_body"}
+        size = len(codec.dumps(compact))
+        if size > budget:
+            break
+        kept.append(compact)
+        budget -= size
+    kept.reverse()
+
+    return [
+        types.EmbeddedResource(
+            type="resource",
+            resource=types.TextResourceContents(
+                uri=AnyUrl(f"zendesk://tickets/{ticket_id}"),
+                mimeType="application/json",
+                text=ticket_text,
+            ),
+        ),
+        types.EmbeddedResource(
+            type="resource",
+            resource=types.TextResourceContents(
+                uri=AnyUrl(f"zendesk://tickets/{ticket_id}/comments"),
+                mimeType="application/json",
+                text=codec.dumps({
+                    "comments": kept,
+                    "total": len(comments),
+                    "omitted_oldest": len(comments) - len(kept),
+                }),
+            ),
+        ),
+    ]
+
+
 @server.get_prompt()
 async def handle_get_prompt(name: str, arguments: Dict[str, str] | None) -> types.GetPromptResult:
     """Handle prompt requests"""
@@ -107,6 +298,11 @@ async def handle_get_prompt(name: str, arguments: Dict[str, str] | None) -> type
         else:
             raise ValueError(f"Unknown prompt: {name}")
 
+        attachments = []
+        if arguments.get("include_data", "").lower() == "true":
+            attachments = await prefetch_ticket_resources(ticket_id)
+            prompt += PREFETCHED_DATA_NOTE
+
         return types.GetPromptResult(
             description=description,
             messages=[
@@ -114,6 +310,9 @@ async def handle_get_prompt(name: str, arguments: Dict[str, str] | None) -> type
                     role="user",
                     content=types.TextContent(type="text", text=prompt.strip()),
                 )
+            ] + [
+                types.PromptMessage(role="user", content=attachment)
+                for attachment in attachments
             ],
         )
 
@@ -135,6 +334,35 @@ async def handle_list_tools() -> list[types.Tool]:
                     "ticket_id": {
                         "type": "integer",
                         "description": "The ID of the ticket to retrieve"
+                    },
+                    "include_names": {
+                        "type": "boolean",
+                        "description": "If true, add requester, assignee and organization names",
+                        "default": False
+                    }
+                },
+                "required": ["ticket_id"]
+            }
+        ),
+        types.Tool(
+            name="get_ticket_context",
+            description="Fetch everything needed to triage a ticket in one call: the ticket, its latest comments with author names, requester, assignee and organization records, and the best matching knowledge base articles",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ticket_id": {
+                        "type": "integer",
+                        "description": "The ID of the ticket"
+                    },
+                    "max_comments": {
+                        "type": "integer",
+                        "description": "Number of most recent comments to include",
+                        "default": 20
+                    },
+                    "max_articles": {
+                        "type": "integer",
+                        "description": "Number of related knowledge base articles to include (0 to skip)",
+                        "default": 3
                     }
                 },
                 "required": ["ticket_id"]
@@ -153,7 +381,7 @@ async def handle_list_tools() -> list[types.Tool]:
                     "priority": {"type": "string", "description": "low, normal, high, urgent"},
                     "type": {"type": "string", "description": "problem, incident, question, task"},
                     "tags": {"type": "array", "items": {"type": "string"}},
-                    "custom_fields": {"type": "array", "items": {"type": "object"}},
+                    "custom_fields": {"type": "array", "items": {"type": "object"}, "description": "List of {id, value}; see resolve_names with kind ticket_fields"},
                 },
                 "required": ["subject", "description"],
             }
@@ -201,11 +429,205 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "boolean",
                         "description": "If true, fetch only tickets created or updated in the last 30 days",
                         "default": False
+                    },
+                    "include_names": {
+                        "type": "boolean",
+                        "description": "If true, add requester and assignee names",
+                        "default": False
                     }
                 },
                 "required": []
             }
         ),
+        types.Tool(
+            name="get_ticket_changes",
+            description="Poll for tickets created or updated since the previous call. Returns only the changed tickets and a cursor; pass the cursor to the next call instead of re-reading ticket lists",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor returned by the previous call"
+                    },
+                    "start_time": {
+                        "type": "string",
+                        "description": "Without a cursor, report changes since this time (ISO 8601 or unix seconds). Defaults to one hour ago"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum tickets per call (max 1000). has_more is true when more changes are waiting",
+                        "default": 100
+                    },
+                    "include_names": {
+                        "type": "boolean",
+                        "description": "If true, add requester and assignee names",
+                        "default": False
+                    }
+                },
+                "required": []
+            }
+        ),
+        types.Tool(
+            name="find_similar_tickets",
+            description="Find tickets similar to a ticket or to free text, e.g. to spot duplicates. Compares subjects and descriptions locally (TF-IDF) against tickets this server has already read, without searching the API",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ticket_id": {
+                        "type": "integer",
+                        "description": "Ticket to find similar tickets for"
+                    },
+                    "text": {
+                        "type": "string",
+                        "description": "Free text to compare against, used when ticket_id is not given"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of similar tickets (max 50)",
+                        "default": 5
+                    },
+                    "min_score": {
+                        "type": "number",
+                        "description": "Lowest similarity to report, between 0 and 1",
+                        "default": 0.1
+                    },
+                    "mirror_path": {
+                        "type": "string",
+                        "description": "Local NDJSON ticket mirror (e.g. written by export_tickets) to add to the index first"
+                    }
+                },
+                "required": []
+            }
+        ),
+        types.Tool(
+            name="search_tickets",
+            description="Search tickets using Zendesk search syntax (e.g. 'status:open priority:urgent organization:acme'). Streams results via the search export API and returns compact ticket records",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query using Zendesk search syntax. Do not include 'type:ticket', it is implied"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of tickets to return (max 1000)",
+                        "default": 100
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
+        types.Tool(
+            name="count_tickets",
+            description="Count tickets in a single request, optionally scoped to an organization or a user's requested/ccd/assigned tickets. Use count_search for counts with other filters",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "organization_id": {
+                        "type": "integer",
+                        "description": "Count tickets of this organization"
+                    },
+                    "user_id": {
+                        "type": "integer",
+                        "description": "Count tickets of this user (requires ticket_type)"
+                    },
+                    "ticket_type": {
+                        "type": "string",
+                        "description": "Type of user tickets to count. Requires user_id.",
+                        "enum": ["requested", "ccd", "assigned"]
+                    }
+                },
+                "required": []
+            }
+        ),
+        types.Tool(
+            name="count_search",
+            description="Count results of a Zendesk search query in a single request (e.g. 'type:ticket status:open priority:urgent organization:acme')",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query using Zendesk search syntax. Include 'type:ticket' to count only tickets"
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
+        types.Tool(
+            name="aggregate_tickets",
+            description="Summarize a ticket set server-side in one pass: group-by counts, age percentiles (hours) and the oldest unresolved tickets. Use instead of paging through get_tickets for breakdown questions",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query using Zendesk search syntax selecting the tickets (e.g. 'status<solved created>=2024-06-01'). 'type:ticket' is implied"
+                    },
+                    "mirror_path": {
+                        "type": "string",
+                        "description": "Path to a local NDJSON (or .ndjson.gz) ticket mirror to read instead of the API"
+                    },
+                    "filters": {
+                        "type": "object",
+                        "description": "Field equality filters applied locally, e.g. {\"status\": [\"open\", \"pending\"]}"
+                    },
+                    "group_by": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["status", "priority", "type", "assignee_id", "requester_id",
+                                     "organization_id", "group_id", "brand_id", "submitter_id"]
+                        },
+                        "description": "Ticket fields to break counts down by"
+                    },
+                    "oldest_limit": {
+                        "type": "integer",
+                        "description": "Number of oldest unresolved tickets to include",
+                        "default": 10
+                    },
+                    "max_tickets": {
+                        "type": "integer",
+                        "description": "Maximum number of tickets to scan (max 100000)",
+                        "default": 10000
+                    }
+                },
+                "required": []
+            }
+        ),
+        types.Tool(
+            name="export_tickets",
+            description="Export all tickets updated in a time range (optionally with comments) to a local NDJSON file for offline analysis, e.g. with aggregate_tickets' mirror_path. Returns only the file path and counts. Interrupted exports resume when called again with the same arguments",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Output file path, gzip-compressed when it ends with .gz"
+                    },
+                    "start_time": {
+                        "type": "string",
+                        "description": "Export tickets updated at or after this time (ISO 8601 date/datetime or unix seconds)"
+                    },
+                    "end_time": {
+                        "type": "string",
+                        "description": "Skip tickets updated after this time (ISO 8601 date/datetime or unix seconds)"
+                    },
+                    "include_comments": {
+                        "type": "boolean",
+                        "description": "Include each ticket's comments",
+                        "default": False
+                    },
+                    "resume": {
+                        "type": "boolean",
+                        "description": "Continue an interrupted export of the same file and range",
+                        "default": True
+                    }
+                },
+                "required": ["path", "start_time"]
+            }
+        ),
         types.Tool(
             name="get_ticket_comments",
             description="Retrieve all comments for a Zendesk ticket by its ID",
@@ -215,11 +637,45 @@ async def handle_list_tools() -> list[types.Tool]:
                     "ticket_id": {
                         "type": "integer",
                         "description": "The ID of the ticket to get comments for"
+                    },
+                    "include_names": {
+                        "type": "boolean",
+                        "description": "If true, add comment author names",
+                        "default": False
                     }
                 },
                 "required": ["ticket_id"]
             }
         ),
+        types.Tool(
+            name="get_attachment",
+            description="Read a ticket comment attachment by its ID (listed in get_ticket_comments). Returns a byte range inline (decoded text for text types, base64 otherwise) or, with save=true, streams the whole file to a local temporary file and returns its path",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "attachment_id": {
+                        "type": "integer",
+                        "description": "The ID of the attachment"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "First byte to read inline",
+                        "default": 0
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": "Number of bytes to read inline (capped at ZENDESK_ATTACHMENT_INLINE_KB, 256 KiB by default)",
+                        "default": 65536
+                    },
+                    "save": {
+                        "type": "boolean",
+                        "description": "If true, download the whole attachment to a temporary file instead",
+                        "default": False
+                    }
+                },
+                "required": ["attachment_id"]
+            }
+        ),
         types.Tool(
             name="create_ticket_comment",
             description="Create a new comment on an existing Zendesk ticket",
@@ -257,7 +713,7 @@ async def handle_list_tools() -> list[types.Tool]:
                     "assignee_id": {"type": "integer"},
                     "requester_id": {"type": "integer"},
                     "tags": {"type": "array", "items": {"type": "string"}},
-                    "custom_fields": {"type": "array", "items": {"type": "object"}},
+                    "custom_fields": {"type": "array", "items": {"type": "object"}, "description": "List of {id, value}; see resolve_names with kind ticket_fields"},
                     "due_at": {"type": "string", "description": "ISO8601 datetime"}
                 },
                 "required": ["ticket_id"]
@@ -328,8 +784,374 @@ async def handle_list_tools() -> list[types.Tool]:
                 },
                 "required": []
             }
+        ),
+        types.Tool(
+            name="resolve_names",
+            description="Resolve group, organization or ticket field names to ids from a local cache, including each ticket field's type and allowed option values. Use it before filtering by group_id or organization_id or setting custom_fields",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "kind": {
+                        "type": "string",
+                        "enum": ["groups", "organizations", "ticket_fields"],
+                        "description": "Kind of record to resolve"
+                    },
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Names to resolve (exact match ignoring case, else substring). Lists the records of the kind when omitted"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum matches per name, or records listed",
+                        "default": 25
+                    }
+                },
+                "required": ["kind"]
+            }
+        ),
+        types.Tool(
+            name="batch",
+            description="Run several read-only tool calls concurrently in one request and return their results keyed by operation id. Failures are reported per operation. Allowed tools: get_ticket, get_tickets, search_tickets, count_tickets, count_search, get_ticket_comments, get_attachment (without save), list_users, search_users, resolve_names, get_ticket_changes, find_similar_tickets",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": "Operations to run (max 50)",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {
+                                    "type": "string",
+                                    "description": "Key for this operation's result (defaults to its index)"
+                                },
+                                "tool": {
+                                    "type": "string",
+                                    "description": "Name of the read-only tool to call"
+                                },
+                                "arguments": {
+                                    "type": "object",
+                                    "description": "Arguments for the tool"
+                                }
+                            },
+                            "required": ["tool"]
+                        }
+                    }
+                },
+                "required": ["operations"]
+            }
+        )
+    ]
+
+
+def execute_tool(name: str, arguments: dict[str, Any] | None) -> Any:
+    """Run a Zendesk tool synchronously and return its result data"""
+    if name == "get_ticket":
+        if not arguments:
+            raise ValueError("Missing arguments")
+        ticket = zendesk_client.get_ticket(arguments["ticket_id"])
+        if arguments.get("include_names"):
+            zendesk_client.enrich_tickets([ticket])
+        return ticket
+
+    elif name == "create_ticket":
+        if not arguments:
+            raise ValueError("Missing arguments")
+        created = zendesk_client.create_ticket(
+            subject=arguments.get("subject"),
+            description=arguments.get("description"),
+            requester_id=arguments.get("requester_id"),
+            assignee_id=arguments.get("assignee_id"),
+            priority=arguments.get("priority"),
+            type=arguments.get("type"),
+            tags=arguments.get("tags"),
+            custom_fields=arguments.get("custom_fields"),
+        )
+        return {"message": "Ticket created successfully", "ticket": created}
+
+    elif name == "get_tickets":
+        page = arguments.get("page", 1) if arguments else 1
+        per_page = arguments.get("per_page", 25) if arguments else 25
+        sort_by = arguments.get("sort_by", "created_at") if arguments else "created_at"
+        sort_order = arguments.get("sort_order", "desc") if arguments else "desc"
+        organization_id = arguments.get("organization_id") if arguments else None
+        user_id = arguments.get("user_id") if arguments else None
+        ticket_type = arguments.get("ticket_type") if arguments else None
+        recent = arguments.get("recent", False) if arguments else False
+
+        tickets = zendesk_client.get_tickets(
+            page=page,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            organization_id=organization_id,
+            user_id=user_id,
+            ticket_type=ticket_type,
+            recent=recent
+        )
+        if arguments and arguments.get("include_names"):
+            zendesk_client.enrich_tickets(tickets["tickets"])
+        return tickets
+
+    elif name == "get_ticket_changes":
+        changes = zendesk_client.get_ticket_changes(
+            cursor=arguments.get("cursor") if arguments else None,
+            start_time=arguments.get("start_time") if arguments else None,
+            limit=arguments.get("limit", 100) if arguments else 100
+        )
+        if arguments and arguments.get("include_names"):
+            zendesk_client.enrich_tickets(changes["tickets"])
+        return changes
+
+    elif name == "find_similar_tickets":
+        if not arguments or (arguments.get("ticket_id") is None and not arguments.get("text")):
+            raise ValueError("Either 'ticket_id' or 'text' must be provided")
+        return zendesk_client.find_similar_tickets(
+            ticket_id=arguments.get("ticket_id"),
+            text=arguments.get("text"),
+            limit=arguments.get("limit", 5),
+            min_score=arguments.get("min_score", 0.1),
+            mirror_path=arguments.get("mirror_path")
+        )
+
+    elif name == "search_tickets":
+        if not arguments or not arguments.get("query"):
+            raise ValueError("Missing required argument: query")
+        tickets = zendesk_client.search_tickets(
+            query=arguments["query"],
+            limit=arguments.get("limit", 100)
+        )
+        return tickets
+
+    elif name == "count_tickets":
+        counts = zendesk_client.count_tickets(
+            organization_id=arguments.get("organization_id") if arguments else None,
+            user_id=arguments.get("user_id") if arguments else None,
+            ticket_type=arguments.get("ticket_type") if arguments else None
+        )
+        return counts
+
+    elif name == "count_search":
+        if not arguments or not arguments.get("query"):
+            raise ValueError("Missing required argument: query")
+        counts = zendesk_client.count_search(query=arguments["query"])
+        return counts
+
+    elif name == "aggregate_tickets":
+        if not arguments or not (arguments.get("query") or arguments.get("mirror_path")):
+            raise ValueError("Either 'query' or 'mirror_path' must be provided")
+        summary = zendesk_client.aggregate_tickets(
+            query=arguments.get("query"),
+            mirror_path=arguments.get("mirror_path"),
+            filters=arguments.get("filters"),
+            group_by=arguments.get("group_by"),
+            oldest_limit=arguments.get("oldest_limit", 10),
+            max_tickets=arguments.get("max_tickets", 10000)
         )
+        return summary
+
+    elif name == "export_tickets":
+        if not arguments or "path" not in arguments or "start_time" not in arguments:
+            raise ValueError("Missing required arguments: path and start_time")
+        return zendesk_client.export_tickets(
+            path=arguments["path"],
+            start_time=arguments["start_time"],
+            end_time=arguments.get("end_time"),
+            include_comments=arguments.get("include_comments", False),
+            resume=arguments.get("resume", True)
+        )
+
+    elif name == "get_ticket_comments":
+        if not arguments:
+            raise ValueError("Missing arguments")
+        comments = zendesk_client.get_ticket_comments(
+            arguments["ticket_id"])
+        if arguments.get("include_names"):
+            zendesk_client.enrich_comments(comments)
+        return comments
+
+    elif name == "get_attachment":
+        if not arguments or "attachment_id" not in arguments:
+            raise ValueError("Missing required argument: attachment_id")
+        if arguments.get("save"):
+            return zendesk_client.download_attachment(arguments["attachment_id"])
+        return zendesk_client.read_attachment(
+            arguments["attachment_id"],
+            offset=arguments.get("offset", 0),
+            length=arguments.get("length", 65536)
+        )
+
+    elif name == "create_ticket_comment":
+        if not arguments:
+            raise ValueError("Missing arguments")
+        public = arguments.get("public", True)
+        result = zendesk_client.post_comment(
+            ticket_id=arguments["ticket_id"],
+            comment=arguments["comment"],
+            public=public
+        )
+        return f"Comment created successfully: {result}"
+
+    elif name == "update_ticket":
+        if not arguments:
+            raise ValueError("Missing arguments")
+        ticket_id = arguments.get("ticket_id")
+        if ticket_id is None:
+            raise ValueError("ticket_id is required")
+        update_fields = {k: v for k, v in arguments.items() if k != "ticket_id"}
+        updated = zendesk_client.update_ticket(ticket_id=int(ticket_id), **update_fields)
+        return {"message": "Ticket updated successfully", "ticket": updated}
+
+    elif name == "list_users":
+        page = arguments.get("page", 1) if arguments else 1
+        per_page = arguments.get("per_page", 25) if arguments else 25
+        sort_by = arguments.get("sort_by", "name") if arguments else "name"
+        sort_order = arguments.get("sort_order", "asc") if arguments else "asc"
+        group_id = arguments.get("group_id") if arguments else None
+        organization_id = arguments.get("organization_id") if arguments else None
+
+        users = zendesk_client.list_users(
+            page=page,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            group_id=group_id,
+            organization_id=organization_id
+        )
+        return users
+
+    elif name == "search_users":
+        query = arguments.get("query") if arguments else None
+        external_id = arguments.get("external_id") if arguments else None
+        page = arguments.get("page", 1) if arguments else 1
+        per_page = arguments.get("per_page", 25) if arguments else 25
+
+        if not query and not external_id:
+            raise ValueError("Either 'query' or 'external_id' must be provided")
+
+        users = zendesk_client.search_users(
+            query=query,
+            external_id=external_id,
+            page=page,
+            per_page=per_page
+        )
+        return users
+
+    elif name == "resolve_names":
+        if not arguments or not arguments.get("kind"):
+            raise ValueError("Missing required argument: kind")
+        return zendesk_client.resolve_names(
+            kind=arguments["kind"],
+            names=arguments.get("names"),
+            limit=arguments.get("limit", 25)
+        )
+
+    else:
+        raise ValueError(f"Unknown tool: {name}")
+
+
+async def run_batch(arguments: dict[str, Any] | None) -> Dict[str, Any]:
+    """Run read-only tool calls concurrently and key their results by operation id"""
+    operations = arguments.get("operations") if arguments else None
+    if not operations:
+        raise ValueError("Missing required argument: operations")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f"A batch accepts at most {MAX_BATCH_OPERATIONS} operations")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_operation(operation: dict[str, Any]) -> Dict[str, Any]:
+        tool = operation.get("tool")
+        if tool not in BATCH_TOOLS:
+            return {"tool": tool, "error": f"Tool not allowed in batch: {tool}"}
+        # Batches are read-only, saving an attachment writes a local file
+        if tool == "get_attachment" and (operation.get("arguments") or {}).get("save"):
+            return {"tool": tool, "error": "get_attachment with save=true is not allowed in batch"}
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(execute_tool, tool, operation.get("arguments") or {})
+                return {"tool": tool, "result": result}
+            except Exception as e:
+                return {"tool": tool, "error": str(e)}
+
+    keys = [str(operation.get("id", index)) for index, operation in enumerate(operations)]
+    if len(set(keys)) != len(keys):
+        raise ValueError("Operation ids must be unique")
+    results = await asyncio.gather(*(run_operation(operation) for operation in operations))
+    return dict(zip(keys, results))
+
+
+async def build_ticket_context(
+        ticket_id: int,
+        max_comments: int = 20,
+        max_articles: int = 3
+) -> Dict[str, Any]:
+    """Fetch a ticket with its comments, people and related articles in parallel"""
+    ticket, comments = await asyncio.gather(
+        asyncio.to_thread(zendesk_client.get_ticket, ticket_id),
+        asyncio.to_thread(zendesk_client.get_ticket_comments, ticket_id),
+    )
+    comment_count = len(comments)
+    comments = comments[-max_comments:] if max_comments > 0 else []
+
+    lookups = [
+        asyncio.to_thread(
+            zendesk_client.resolve_users,
+            [ticket.get("requester_id"), ticket.get("assignee_id")] + [c.get("author_id") for c in comments]
+        ),
+        asyncio.to_thread(zendesk_client.resolve_organizations, [ticket.get("organization_id")]),
     ]
+    if max_articles > 0 and ticket.get("subject"):
+        lookups.append(asyncio.to_thread(zendesk_client.search_articles, ticket["subject"], max_articles))
+    results = await asyncio.gather(*lookups, return_exceptions=True)
+
+    # People and articles only enrich the bundle, the ticket is still useful without them
+    users, organizations = [r if isinstance(r, dict) else {} for r in results[:2]]
+    articles = results[2] if len(results) > 2 and isinstance(results[2], list) else []
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Partial context for ticket {ticket_id}: {result}")
+
+    return {
+        "ticket": ticket,
+        "requester": users.get(ticket.get("requester_id")),
+        "assignee": users.get(ticket.get("assignee_id")),
+        "organization": organizations.get(ticket.get("organization_id")),
+        "comments": [{
+            "id": comment.get("id"),
+            "author_id": comment.get("author_id"),
+            "author_name": users.get(comment.get("author_id"), {}).get("name"),
+            "public": comment.get("public"),
+            "created_at": comment.get("created_at"),
+            "body": comment.get("body"),
+        } for comment in comments],
+        "comment_count": comment_count,
+        "related_articles": articles,
+    }
+
+
+async def dispatch_tool(name: str, arguments: dict[str, Any] | None) -> Any:
+    """Route a tool call to its async handler or run it in a worker thread"""
+    if name == "batch":
+        return await run_batch(arguments)
+    elif name == "get_ticket_context":
+        if not arguments or "ticket_id" not in arguments:
+            raise ValueError("Missing required argument: ticket_id")
+        return await build_ticket_context(
+            ticket_id=int(arguments["ticket_id"]),
+            max_comments=arguments.get("max_comments", 20),
+            max_articles=arguments.get("max_articles", 3)
+        )
+    # Zendesk calls block, keep them off the event loop
+    return await asyncio.to_thread(execute_tool, name, arguments)
+
+
+async def scheduled_dispatch(name: str, arguments: dict[str, Any] | None) -> Any:
+    """Wait for a scheduler slot for the tool, then dispatch it"""
+    async with scheduler.slot(name):
+        sync_invalidations()
+        return await dispatch_tool(name, arguments)
 
 
 @server.call_tool()
@@ -338,140 +1160,29 @@ async def handle_call_tool(
         arguments: dict[str, Any] | None
 ) -> list[types.TextContent]:
     """Handle Zendesk tool execution requests"""
+    timeout = tool_timeout(name, arguments)
     try:
-        if name == "get_ticket":
-            if not arguments:
-                raise ValueError("Missing arguments")
-            ticket = zendesk_client.get_ticket(arguments["ticket_id"])
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(ticket)
-            )]
-
-        elif name == "create_ticket":
-            if not arguments:
-                raise ValueError("Missing arguments")
-            created = zendesk_client.create_ticket(
-                subject=arguments.get("subject"),
-                description=arguments.get("description"),
-                requester_id=arguments.get("requester_id"),
-                assignee_id=arguments.get("assignee_id"),
-                priority=arguments.get("priority"),
-                type=arguments.get("type"),
-                tags=arguments.get("tags"),
-                custom_fields=arguments.get("custom_fields"),
-            )
-            return [types.TextContent(
-                type="text",
-                text=json.dumps({"message": "Ticket created successfully", "ticket": created}, indent=2)
-            )]
-
-        elif name == "get_tickets":
-            page = arguments.get("page", 1) if arguments else 1
-            per_page = arguments.get("per_page", 25) if arguments else 25
-            sort_by = arguments.get("sort_by", "created_at") if arguments else "created_at"
-            sort_order = arguments.get("sort_order", "desc") if arguments else "desc"
-            organization_id = arguments.get("organization_id") if arguments else None
-            user_id = arguments.get("user_id") if arguments else None
-            ticket_type = arguments.get("ticket_type") if arguments else None
-            recent = arguments.get("recent", False) if arguments else False
-
-            tickets = zendesk_client.get_tickets(
-                page=page,
-                per_page=per_page,
-                sort_by=sort_by,
-                sort_order=sort_order,
-                organization_id=organization_id,
-                user_id=user_id,
-                ticket_type=ticket_type,
-                recent=recent
-            )
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(tickets, indent=2)
-            )]
-
-        elif name == "get_ticket_comments":
-            if not arguments:
-                raise ValueError("Missing arguments")
-            comments = zendesk_client.get_ticket_comments(
-                arguments["ticket_id"])
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(comments)
-            )]
-
-        elif name == "create_ticket_comment":
-            if not arguments:
-                raise ValueError("Missing arguments")
-            public = arguments.get("public", True)
-            result = zendesk_client.post_comment(
-                ticket_id=arguments["ticket_id"],
-                comment=arguments["comment"],
-                public=public
-            )
-            return [types.TextContent(
-                type="text",
-                text=f"Comment created successfully: {result}"
-            )]
-
-        elif name == "update_ticket":
-            if not arguments:
-                raise ValueError("Missing arguments")
-            ticket_id = arguments.get("ticket_id")
-            if ticket_id is None:
-                raise ValueError("ticket_id is required")
-            update_fields = {k: v for k, v in arguments.items() if k != "ticket_id"}
-            updated = zendesk_client.update_ticket(ticket_id=int(ticket_id), **update_fields)
-            return [types.TextContent(
-                type="text",
-                text=json.dumps({"message": "Ticket updated successfully", "ticket": updated}, indent=2)
-            )]
-
-        elif name == "list_users":
-            page = arguments.get("page", 1) if arguments else 1
-            per_page = arguments.get("per_page", 25) if arguments else 25
-            sort_by = arguments.get("sort_by", "name") if arguments else "name"
-            sort_order = arguments.get("sort_order", "asc") if arguments else "asc"
-            group_id = arguments.get("group_id") if arguments else None
-            organization_id = arguments.get("organization_id") if arguments else None
-
-            users = zendesk_client.list_users(
-                page=page,
-                per_page=per_page,
-                sort_by=sort_by,
-                sort_order=sort_order,
-                group_id=group_id,
-                organization_id=organization_id
-            )
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(users, indent=2)
-            )]
-
-        elif name == "search_users":
-            query = arguments.get("query") if arguments else None
-            external_id = arguments.get("external_id") if arguments else None
-            page = arguments.get("page", 1) if arguments else 1
-            per_page = arguments.get("per_page", 25) if arguments else 25
-
-            if not query and not external_id:
-                raise ValueError("Either 'query' or 'external_id' must be provided")
-
-            users = zendesk_client.search_users(
-                query=query,
-                external_id=external_id,
-                page=page,
-                per_page=per_page
-            )
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(users, indent=2)
-            )]
+        # Upstream requests made for this call are bounded by the same deadline
+        with deadline(timeout):
+            result = await asyncio.wait_for(scheduled_dispatch(name, arguments), timeout)
 
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        if not isinstance(result, str):
+            result = codec.dumps(result, indent=name in PRETTY_PRINTED_TOOLS)
+        return [types.TextContent(
+            type="text",
+            text=result
+        )]
 
+    except asyncio.TimeoutError:
+        metrics.incr("tool.deadline_exceeded")
+        message = f"Error: {name} did not complete within {timeout:g} seconds"
+        # The write keeps running in its worker thread and may still be applied
+        if scheduler.priority(name) == WRITE:
+            message += ". The write may still complete, check the ticket before retrying"
+        return [types.TextContent(
+            type="text",
+            text=message
+        )]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -488,13 +1199,75 @@ async def handle_list_resources() -> list[types.Resource]:
             name="Zendesk Knowledge Base",
             description="Access to Zendesk Help Center articles and sections",
             mimeType="application/json",
+        ),
+        types.Resource(
+            uri=AnyUrl("zendesk://server-metrics"),
+            name="Zendesk Server Metrics",
+            description="Counters and upstream latency percentiles of this server process",
+            mimeType="application/json",
         )
     ]
 
 
-@ttl_cache(ttl=3600)
-def get_cached_kb():
-    return zendesk_client.get_all_articles()
+@server.list_resource_templates()
+async def handle_list_resource_templates() -> list[types.ResourceTemplate]:
+    return [
+        types.ResourceTemplate(
+            uriTemplate="zendesk://knowledge-base/articles/{article_id}",
+            name="Zendesk Help Center Article",
+            description="A single Help Center article, including a body left out of the knowledge base resource to save memory",
+            mimeType="application/json",
+        )
+    ]
+
+
+# Knowledge base last loaded by this process, served while Zendesk is unavailable
+last_known_kb: Dict[str, Any] = {}
+
+
+def build_kb_store(kb: Dict[str, Any]) -> KnowledgeBaseStore:
+    return KnowledgeBaseStore.from_dict(kb, max_bytes=KB_MAX_BYTES, load_body=zendesk_client.get_article_body)
+
+
+@ttl_cache(ttl=KB_CACHE_TTL)
+def get_cached_kb() -> KnowledgeBaseStore:
+    if persistent_cache:
+        entry = persistent_cache.get("kb", "all")
+        if entry and not entry.expired:
+            store = build_kb_store(entry.value)
+            last_known_kb.update(kb=store, stored_at=entry.stored_at)
+            return store
+
+    kb = zendesk_client.get_all_articles()
+    if persistent_cache:
+        persistent_cache.set("kb", "all", kb, KB_CACHE_TTL)
+    store = build_kb_store(kb)
+    last_known_kb.update(kb=store, stored_at=time.time())
+    return store
+
+
+def get_stale_kb() -> tuple[KnowledgeBaseStore, float] | None:
+    """Return the most recent knowledge base copy and when it was stored, even if expired"""
+    if persistent_cache:
+        entry = persistent_cache.get("kb", "all")
+        if entry and entry.stored_at > last_known_kb.get("stored_at", 0):
+            return build_kb_store(entry.value), entry.stored_at
+    if last_known_kb:
+        return last_known_kb["kb"], last_known_kb["stored_at"]
+    return None
+
+
+def load_kb() -> tuple[KnowledgeBaseStore, Dict[str, Any]]:
+    """Return the cached knowledge base, or the last copy marked stale while Zendesk is unavailable"""
+    try:
+        return get_cached_kb(), {}
+    except Exception as e:
+        stale = get_stale_kb() if is_outage(e) else None
+        if stale is None:
+            logger.error(f"Error fetching knowledge base: {e}")
+            raise
+        logger.warning(f"Serving stale knowledge base: {e}")
+        return stale[0], {"stale": True, "stale_age_seconds": int(time.time() - stale[1])}
 
 
 @server.read_resource()
@@ -505,25 +1278,86 @@ async def handle_read_resource(uri: AnyUrl) -> str:
         raise ValueError(f"Unsupported URI scheme: {uri.scheme}")
 
     path = str(uri).replace("zendesk://", "")
+    sync_invalidations()
+    if path == "server-metrics":
+        return codec.dumps({
+            **metrics.snapshot(),
+            "circuits": zendesk_client.breakers.states(),
+            "prefetch": zendesk_client.prefetcher.stats() if zendesk_client.prefetcher else None,
+            "scheduler": scheduler.stats(),
+            "metadata": zendesk_client.metadata.stats() if zendesk_client.metadata else None,
+            "similarity": zendesk_client.similarity.stats() if zendesk_client.similarity else None
+        }, indent=True)
+    if path.startswith("knowledge-base/articles/"):
+        article_id = path.rsplit("/", 1)[1]
+        if not article_id.isdigit():
+            raise ValueError(f"Invalid article id: {article_id}")
+        kb_data, metadata = load_kb()
+        article = await asyncio.to_thread(kb_data.article, int(article_id))
+        if article is None:
+            raise ValueError(f"Unknown article: {article_id}")
+        return codec.dumps({**article, **metadata}, indent=True)
     if path != "knowledge-base":
         logger.error(f"Unknown resource path: {path}")
         raise ValueError(f"Unknown resource path: {path}")
 
+    kb_data, metadata = load_kb()
+    stats = kb_data.stats()
+    metadata = {
+        "sections": stats["sections"],
+        "total_articles": stats["articles"],
+        "evicted_bodies": stats["evicted_bodies"],
+        **metadata
+    }
+    # Rendered compactly article by article instead of expanding the whole knowledge base into dicts
+    return "".join(['{"knowledge_base":', *kb_data.iter_json(), ',"metadata":', codec.dumps(metadata), "}"])
+
+
+def invalidate_cached(kind: str, record_id: int | None) -> None:
+    """Evict cache entries affected by a Zendesk webhook event"""
+    logger.info(f"Invalidating cached {kind} {record_id}")
+    if kind == "ticket" and record_id is not None:
+        zendesk_client.invalidate_ticket(record_id)
+    elif kind == "user" and record_id is not None:
+        zendesk_client.invalidate_user(record_id)
+    elif kind == "organization" and record_id is not None:
+        zendesk_client.invalidate_organization(record_id)
+    elif kind == "article":
+        get_cached_kb.cache_clear()
+        if persistent_cache:
+            persistent_cache.delete("kb", "all")
+            persistent_cache.publish_invalidation("article", record_id)
+
+
+def sync_invalidations() -> None:
+    """Drop in-memory copies invalidated by other server processes sharing the persistent cache"""
+    events = zendesk_client.sync_invalidations()
+    if any(kind == "article" for kind, _ in events):
+        get_cached_kb.cache_clear()
+
+
+def start_webhook_listener() -> WebhookListener | None:
+    if not os.getenv("ZENDESK_WEBHOOK_PORT"):
+        return None
+    listener = WebhookListener(
+        on_event=invalidate_cached,
+        host=os.getenv("ZENDESK_WEBHOOK_HOST", "127.0.0.1"),
+        port=int(os.getenv("ZENDESK_WEBHOOK_PORT")),
+        secret=os.getenv("ZENDESK_WEBHOOK_SECRET")
+    )
     try:
-        kb_data = get_cached_kb()
-        return json.dumps({
-            "knowledge_base": kb_data,
-            "metadata": {
-                "sections": len(kb_data),
-                "total_articles": sum(len(section['articles']) for section in kb_data.values()),
-            }
-        }, indent=2)
-    except Exception as e:
-        logger.error(f"Error fetching knowledge base: {e}")
-        raise
+        listener.start()
+    except OSError as e:
+        # Another server process on this host already owns the port
+        logger.info(f"Webhook listener not started: {e}")
+        return None
+    return listener
 
 
 async def main():
+    start_webhook_listener()
+    zendesk_client.start_metadata_refresh()
+
     # Run the server using stdin/stdout streams
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
@@ -0,0 +1,194 @@
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List
+import heapq
+import math
+import re
+import threading
+
+TOKEN = re.compile(r'[^\W_]{2,}')
+
+STOPWORDS = frozenset(
+    'a an and are as at be been but by can could did do does for from had has have hello hi how i if in '
+    'into is it its me my no not of on or our please so than thanks thank that the their them then there '
+    'these they this to too us was we were what when where which who why will with would you your'.split()
+)
+
+# Subject terms count this many times as much as description terms
+SUBJECT_WEIGHT = 2
+
+# Only the start of long descriptions is indexed
+MAX_INDEXED_CHARS = 4000
+
+# Query terms found in more than this share of tickets barely discriminate and are skipped
+MAX_DF_FRACTION = 0.5
+
+# Only the highest weighted terms of a query are looked up; the common rest
+# would visit many postings and barely change the ranking
+MAX_QUERY_TERMS = 32
+
+# Document norms are recomputed once this share of the index changed since the last time
+NORM_REBUILD_FRACTION = 0.25
+
+
+def tokenize(text: str | None) -> List[str]:
+    return [token for token in TOKEN.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+def _term_weights(subject: str | None, description: str | None) -> Dict[str, float]:
+    counts = Counter(tokenize(description[:MAX_INDEXED_CHARS] if description else None))
+    for token in tokenize(subject):
+        counts[token] += SUBJECT_WEIGHT
+    # Sublinear term frequency, so a word repeated in a long description does not dominate
+    return {term: 1 + math.log(count) for term, count in counts.items()}
+
+
+class SimilarityIndex:
+    """
+    Incremental TF-IDF index over ticket subjects and descriptions.
+
+    Tickets are kept in an inverted index (term -> ticket id -> weight), so a
+    query only visits tickets sharing a term with it. Adding a ticket costs time
+    proportional to its own terms; the least recently indexed tickets are dropped
+    beyond max_tickets. Document norms are computed when a ticket is added and
+    recomputed in bulk once enough of the index has changed.
+    """
+
+    def __init__(self, max_tickets: int = 20000):
+        self.max_tickets = max_tickets
+        # Least recently indexed first
+        self._tickets: OrderedDict[int, Dict[str, Any]] = OrderedDict()
+        self._terms: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._norms: Dict[int, float] = {}
+        self._changes = 0
+        self._lock = threading.Lock()
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self._terms)) / (1 + len(self._postings.get(term, ())))) + 1
+
+    def _norm(self, weights: Dict[str, float]) -> float:
+        return math.sqrt(sum((weight * self._idf(term)) ** 2 for term, weight in weights.items())) or 1.0
+
+    def _remove(self, ticket_id: int) -> None:
+        if self._tickets.pop(ticket_id, None) is None:
+            return
+        self._norms.pop(ticket_id, None)
+        for term in self._terms.pop(ticket_id):
+            postings = self._postings[term]
+            del postings[ticket_id]
+            if not postings:
+                del self._postings[term]
+        self._changes += 1
+
+    def add_many(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index raw or compact ticket dicts, replacing earlier versions. Deleted
+        tickets are removed. Returns the number of tickets (re)indexed.
+        """
+        indexed = 0
+        with self._lock:
+            for ticket in tickets:
+                ticket_id = ticket.get('id')
+                if ticket_id is None:
+                    continue
+                if ticket.get('status') == 'deleted':
+                    self._remove(ticket_id)
+                    continue
+
+                known = self._tickets.get(ticket_id)
+                if known and known['updated_at'] == ticket.get('updated_at') and known['subject'] == ticket.get('subject'):
+                    self._tickets.move_to_end(ticket_id)
+                    continue
+
+                self._remove(ticket_id)
+                weights = _term_weights(ticket.get('subject'), ticket.get('description'))
+                self._tickets[ticket_id] = {
+                    'id': ticket_id,
+                    'subject': ticket.get('subject'),
+                    'status': ticket.get('status'),
+                    'updated_at': ticket.get('updated_at')
+                }
+                self._terms[ticket_id] = weights
+                for term, weight in weights.items():
+                    self._postings.setdefault(term, {})[ticket_id] = weight
+                self._norms[ticket_id] = self._norm(weights)
+                self._changes += 1
+                indexed += 1
+
+                while len(self._tickets) > self.max_tickets:
+                    self._remove(next(iter(self._tickets)))
+            # Paid for by indexing, so queries never wait for a rebuild
+            self._refresh_norms()
+        return indexed
+
+    def remove(self, ticket_id: int) -> None:
+        with self._lock:
+            self._remove(ticket_id)
+
+    def __contains__(self, ticket_id: int) -> bool:
+        return ticket_id in self._tickets
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def _refresh_norms(self) -> None:
+        if self._changes <= NORM_REBUILD_FRACTION * max(len(self._terms), 1):
+            return
+        idf = {term: self._idf(term) for term in self._postings}
+        self._norms = {
+            ticket_id: math.sqrt(sum((weight * idf[term]) ** 2 for term, weight in weights.items())) or 1.0
+            for ticket_id, weights in self._terms.items()
+        }
+        self._changes = 0
+
+    def similar(
+        self,
+        ticket_id: int | None = None,
+        text: str | None = None,
+        limit: int = 5,
+        min_score: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Most similar indexed tickets by cosine similarity, to an indexed ticket
+        or to free text. The ticket itself is never part of the result.
+        """
+        with self._lock:
+            if ticket_id is not None:
+                weights = self._terms.get(ticket_id, {})
+            else:
+                weights = _term_weights(None, text)
+
+            max_df = MAX_DF_FRACTION * len(self._terms)
+            query = {}
+            for term, weight in weights.items():
+                postings = self._postings.get(term)
+                # Small indexes keep every term, a handful of tickets says little about frequency
+                if postings and (len(postings) <= max_df or len(self._terms) < 20):
+                    query[term] = weight * self._idf(term)
+            if len(query) > MAX_QUERY_TERMS:
+                query = dict(heapq.nlargest(MAX_QUERY_TERMS, query.items(), key=lambda item: item[1]))
+            query_norm = math.sqrt(sum(weight ** 2 for weight in query.values())) or 1.0
+
+            scores: Dict[int, float] = {}
+            for term, query_weight in query.items():
+                idf = self._idf(term)
+                for candidate, weight in self._postings[term].items():
+                    scores[candidate] = scores.get(candidate, 0.0) + query_weight * weight * idf
+            scores.pop(ticket_id, None)
+
+            best = heapq.nlargest(
+                limit,
+                ((score / (query_norm * self._norms[candidate]), candidate) for candidate, score in scores.items())
+            )
+            return [
+                {**self._tickets[candidate], 'score': round(min(score, 1.0), 4)}
+                for score, candidate in best if score >= min_score
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'tickets': len(self._tickets),
+                'terms': len(self._postings),
+                'max_tickets': self.max_tickets
+            }
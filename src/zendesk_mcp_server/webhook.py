@@ -0,0 +1,156 @@
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+import base64
+import hashlib
+import hmac
+import logging
+import threading
+
+from zendesk_mcp_server import codec
+
+logger = logging.getLogger("zendesk-mcp-server")
+
+SIGNATURE_HEADER = 'X-Zendesk-Webhook-Signature'
+TIMESTAMP_HEADER = 'X-Zendesk-Webhook-Signature-Timestamp'
+
+# Reject signed requests older than this to limit replays
+MAX_SIGNATURE_AGE = 300
+
+# Largest request body accepted by the listener
+MAX_BODY_BYTES = 1024 * 1024
+
+# Event type prefixes (zen:event-type:<kind>.<change>) mapped to cache kinds
+EVENT_KINDS = {
+    'ticket': 'ticket',
+    'user': 'user',
+    'organization': 'organization',
+    'article': 'article',
+}
+
+# Keys accepted in custom trigger/automation payloads
+PAYLOAD_ID_KEYS = {
+    'ticket_id': 'ticket',
+    'user_id': 'user',
+    'organization_id': 'organization',
+    'article_id': 'article',
+}
+
+
+def verify_signature(secret: str, body: bytes, timestamp: str | None, signature: str | None) -> bool:
+    """
+    Verify a Zendesk webhook signature: base64(HMAC-SHA256(secret, timestamp + body)).
+    """
+    if not timestamp or not signature:
+        return False
+    try:
+        signed_at = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        if abs((datetime.now(timezone.utc) - signed_at).total_seconds()) > MAX_SIGNATURE_AGE:
+            return False
+    except ValueError:
+        return False
+    digest = hmac.new(secret.encode(), timestamp.encode() + body, hashlib.sha256).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), signature)
+
+
+def parse_event(payload: Dict[str, Any]) -> List[Tuple[str, int | None]]:
+    """
+    Extract (kind, id) pairs from an event-subscription or custom trigger payload.
+    """
+    events = []
+    event_type = payload.get('type')
+    if isinstance(event_type, str) and event_type.startswith('zen:event-type:'):
+        kind = EVENT_KINDS.get(event_type.split(':')[-1].split('.')[0])
+        if kind:
+            detail = payload.get('detail')
+            record_id = detail.get('id') if isinstance(detail, dict) else None
+            events.append((kind, int(record_id) if record_id is not None else None))
+
+    for key, kind in PAYLOAD_ID_KEYS.items():
+        if payload.get(key) is not None:
+            events.append((kind, int(payload[key])))
+    for kind in EVENT_KINDS.values():
+        record = payload.get(kind)
+        if isinstance(record, dict) and record.get('id') is not None:
+            events.append((kind, int(record['id'])))
+
+    return list(dict.fromkeys(events))
+
+
+class WebhookListener:
+    """
+    Local HTTP listener receiving Zendesk webhooks and forwarding the affected
+    records to on_event(kind, record_id) so caches can be evicted immediately.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[str, int | None], None],
+        host: str = '127.0.0.1',
+        port: int = 8787,
+        secret: str | None = None
+    ):
+        self.on_event = on_event
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self._server: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_BODY_BYTES:
+                    self._reply(413, {'error': 'Payload too large'})
+                    return
+                body = self.rfile.read(length)
+
+                if listener.secret and not verify_signature(
+                    listener.secret,
+                    body,
+                    self.headers.get(TIMESTAMP_HEADER),
+                    self.headers.get(SIGNATURE_HEADER)
+                ):
+                    self._reply(401, {'error': 'Invalid signature'})
+                    return
+
+                try:
+                    payload = codec.loads(body)
+                    events = parse_event(payload) if isinstance(payload, dict) else []
+                except (TypeError, ValueError) as e:
+                    # Ids that are not numbers, e.g. lists or objects, make the whole payload malformed
+                    self._reply(400, {'error': f"Invalid payload: {e}"})
+                    return
+
+                for kind, record_id in events:
+                    try:
+                        listener.on_event(kind, record_id)
+                    except Exception as e:
+                        logger.error(f"Error handling webhook event {kind} {record_id}: {e}")
+                self._reply(200, {'events': [{'kind': kind, 'id': record_id} for kind, record_id in events]})
+
+            def _reply(self, status: int, data: Dict[str, Any]) -> None:
+                body = codec.dumpb(data)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"webhook: {format % args}")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, name="zendesk-webhook", daemon=True).start()
+        if not self.secret:
+            logger.warning("Webhook signature verification is disabled, set ZENDESK_WEBHOOK_SECRET")
+        logger.info(f"Listening for Zendesk webhooks on http://{self.host}:{self.port}")
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+import threading
+import time
+
+from zendesk_mcp_server.metrics import metrics
+
+# update_many accepts at most this many tickets per job
+MAX_BATCH_TICKETS = 100
+
+# Per ticket result of a write: the updated ticket record or the error it failed with
+WriteResult = Dict[str, Any] | Exception
+
+
+def merge_ticket_fields(target: Dict[str, Any], fields: Dict[str, Any]) -> None:
+    """
+    Apply a later update on top of pending ones. Fields are replaced, except
+    custom_fields which are merged by field id.
+    """
+    for key, value in fields.items():
+        if key == 'custom_fields' and target.get('custom_fields'):
+            merged = {field.get('id'): field for field in target['custom_fields']}
+            merged.update((field.get('id'), field) for field in value)
+            target[key] = list(merged.values())
+        else:
+            target[key] = value
+
+
+class TicketWriteQueue:
+    """
+    Write-behind queue merging ticket updates issued within a short window.
+
+    Updates to the same ticket are merged in submission order. Once window seconds
+    have passed since the oldest pending update, all pending tickets are handed to
+    write(updates) in a single call, which returns a result per ticket id. A single
+    worker thread performs the writes, so a ticket's updates are never reordered or
+    written concurrently. Every caller receives a Future resolved with the result of
+    the write that included its fields.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Dict[int, Dict[str, Any]]], Dict[int, WriteResult]],
+        window: float = 1.0,
+        max_batch: int = MAX_BATCH_TICKETS
+    ):
+        self.write = write
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[int, Tuple[Dict[str, Any], List[Future]]] = {}
+        self._oldest: float | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, ticket_id: int, fields: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="zendesk-write-queue", daemon=True)
+                self._thread.start()
+            pending = self._pending.get(ticket_id)
+            if pending is None:
+                pending = self._pending[ticket_id] = ({}, [])
+            else:
+                metrics.incr('write_queue.merged')
+            merge_ticket_fields(pending[0], fields)
+            pending[1].append(future)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._cond.notify()
+        return future
+
+    def _take_batch(self) -> Dict[int, Tuple[Dict[str, Any], List[Future]]]:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                remaining = self._oldest + self.window - time.monotonic()
+                if remaining <= 0 or len(self._pending) >= self.max_batch:
+                    break
+                self._cond.wait(remaining)
+
+            ticket_ids = list(self._pending)[:self.max_batch]
+            batch = {ticket_id: self._pending.pop(ticket_id) for ticket_id in ticket_ids}
+            # Whatever did not fit has waited long enough, flush it next
+            self._oldest = self._oldest if self._pending else None
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            metrics.incr('write_queue.flushes')
+            try:
+                results = self.write({ticket_id: fields for ticket_id, (fields, _) in batch.items()})
+            except Exception as e:
+                results = {ticket_id: e for ticket_id in batch}
+
+            for ticket_id, (_, futures) in batch.items():
+                result = results.get(ticket_id)
+                if result is None:
+                    result = Exception(f"No result for ticket {ticket_id}")
+                for future in futures:
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
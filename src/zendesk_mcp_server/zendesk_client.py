@@ -1,23 +1,278 @@
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Callable, Iterable, Iterator, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+import base64
+import contextvars
+import itertools
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
 import urllib.request
 import urllib.parse
-import base64
 
+from cachetools import LRUCache, TTLCache, cachedmethod
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
 from zenpy import Zenpy
 from zenpy.lib.api_objects import Comment
 from zenpy.lib.api_objects import Ticket as ZenpyTicket
 
+from zendesk_mcp_server import codec
+from zendesk_mcp_server.aggregate import TicketAggregator, iter_ndjson_tickets, matches_filters
+from zendesk_mcp_server.circuit import CircuitBreakers, endpoint_family, is_outage, is_throttled
+from zendesk_mcp_server.deadlines import request_timeout
+from zendesk_mcp_server.directory import DirectoryCache, UserIndex, compact_group, compact_organization, compact_user
+from zendesk_mcp_server.export import ExportCheckpoint, append_ndjson, parse_timestamp
+from zendesk_mcp_server.metadata import METADATA_KINDS, MetadataCache
+from zendesk_mcp_server.metrics import metrics
+from zendesk_mcp_server.persistent_cache import PersistentCache
+from zendesk_mcp_server.prefetch import Prefetcher
+from zendesk_mcp_server.ratelimit import RateLimitedSession, RateLimiter
+from zendesk_mcp_server.similarity import SimilarityIndex
+from zendesk_mcp_server.write_queue import TicketWriteQueue
+
+# Hard upper bound on results returned by a single search_tickets call
+MAX_SEARCH_RESULTS = 1000
+
+# Upper bound on tickets streamed by a single aggregate_tickets call
+MAX_AGGREGATE_TICKETS = 100000
+
+# Maximum ids accepted by the show_many endpoints
+SHOW_MANY_BATCH_SIZE = 100
+
+# Number of ETag-validated responses kept in memory for conditional GETs
+CONDITIONAL_CACHE_SIZE = 512
+
+# How long ETag-validated responses are kept in the on-disk cache
+CONDITIONAL_CACHE_TTL = 86400
+
+# Attachment content is streamed in chunks of this size, never buffered whole
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+
+# Default upper bound on attachment bytes returned inline by read_attachment
+MAX_ATTACHMENT_INLINE_BYTES = 256 * 1024
+
+# Content types returned as text rather than base64
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/xml', 'application/csv')
+
+# Latency percentile of an endpoint family after which a hedged request is sent
+HEDGE_PERCENTILE = 95
+
+# Counts are cheap to recompute but are asked repeatedly while a model reasons
+COUNT_CACHE_TTL = 60
+
+logger = logging.getLogger("zendesk-mcp-server")
+
+# Tickets per incremental export page (the API maximum)
+EXPORT_PAGE_SIZE = 1000
+
+# Zendesk allows 10 incremental export requests per minute per account, on top of the general limit
+INCREMENTAL_RATE_LIMIT = 10
+
+# A throttled incremental request is retried after Retry-After (or this many seconds), this many times
+DEFAULT_RETRY_AFTER = 60
+INCREMENTAL_MAX_RETRIES = 5
+
+# How far back get_ticket_changes looks when called without a cursor or start time
+CHANGES_DEFAULT_LOOKBACK = 3600
+
+# The incremental export rejects start times less than a minute in the past
+INCREMENTAL_MIN_AGE = 60
+
+# Mirror tickets added to the similarity index per lock acquisition
+SIMILARITY_INDEX_CHUNK = 1000
+
+# search_users queries that are a single email address, optionally as "email:<address>"
+EMAIL_QUERY = re.compile(r'^\s*(?:email:)?\s*([^\s:@]+@[^\s:@]+)\s*$', re.IGNORECASE)
+
+# Organizations kept in the metadata cache; larger accounts resolve the rest by name through the API
+METADATA_MAX_ORGANIZATIONS = 5000
+
+# A write naming an unknown ticket field reloads the fields, at most this often
+METADATA_MIN_RELOAD = 60
+
+# Polling of background jobs such as update_many
+JOB_POLL_INTERVAL = 0.5
+JOB_TIMEOUT = 120
+
+# Seconds between checks for invalidations published by other processes
+INVALIDATION_POLL_INTERVAL = 1
+
+
+def _mark_stale(value: Dict[str, Any], stored_at: float) -> Dict[str, Any]:
+    """
+    Flag a cached result served while Zendesk is unavailable, with its age.
+    """
+    return {**value, 'stale': True, 'stale_age_seconds': int(time.time() - stored_at)}
+
+
+def _user_record(user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a raw user payload to the dict shape returned by search_users.
+    """
+    return {
+        'id': user.get('id'),
+        'name': user.get('name'),
+        'email': user.get('email'),
+        'role': user.get('role'),
+        'active': user.get('active'),
+        'created_at': user.get('created_at'),
+        'updated_at': user.get('updated_at'),
+        'organization_id': user.get('organization_id'),
+        'external_id': user.get('external_id')
+    }
+
+
+def _ticket_record(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a raw ticket payload to the dict shape returned by get_ticket.
+    """
+    return {
+        'id': ticket.get('id'),
+        'subject': ticket.get('subject'),
+        'description': ticket.get('description'),
+        'status': ticket.get('status'),
+        'priority': ticket.get('priority'),
+        'created_at': ticket.get('created_at'),
+        'updated_at': ticket.get('updated_at'),
+        'requester_id': ticket.get('requester_id'),
+        'assignee_id': ticket.get('assignee_id'),
+        'organization_id': ticket.get('organization_id'),
+        'tags': list(ticket.get('tags') or [])
+    }
+
+
+def _written_ticket_record(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a raw ticket payload to the dict shape returned by create_ticket and update_ticket.
+    """
+    return {
+        'id': ticket.get('id'),
+        'subject': ticket.get('subject'),
+        'description': ticket.get('description'),
+        'status': ticket.get('status'),
+        'priority': ticket.get('priority'),
+        'type': ticket.get('type'),
+        'created_at': ticket.get('created_at'),
+        'updated_at': ticket.get('updated_at'),
+        'requester_id': ticket.get('requester_id'),
+        'assignee_id': ticket.get('assignee_id'),
+        'organization_id': ticket.get('organization_id'),
+        'tags': list(ticket.get('tags') or [])
+    }
+
+
+def _attachment_record(attachment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': attachment.get('id'),
+        'file_name': attachment.get('file_name'),
+        'content_type': attachment.get('content_type'),
+        'size': attachment.get('size'),
+        'content_url': attachment.get('content_url')
+    }
+
+
+def _comment_record(comment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': comment.get('id'),
+        'author_id': comment.get('author_id'),
+        'body': comment.get('body'),
+        'html_body': comment.get('html_body'),
+        'public': comment.get('public'),
+        'created_at': comment.get('created_at'),
+        'attachments': [_attachment_record(a) for a in comment.get('attachments') or []]
+    }
+
+
+def _compact_ticket(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a raw ticket payload to the essential fields returned by list-style tools.
+    """
+    return {
+        'id': ticket.get('id'),
+        'subject': ticket.get('subject'),
+        'status': ticket.get('status'),
+        'priority': ticket.get('priority'),
+        'description': ticket.get('description'),
+        'created_at': ticket.get('created_at'),
+        'updated_at': ticket.get('updated_at'),
+        'requester_id': ticket.get('requester_id'),
+        'assignee_id': ticket.get('assignee_id')
+    }
+
 
 class ZendeskClient:
-    def __init__(self, subdomain: str, email: str, token: str):
+    def __init__(
+        self,
+        subdomain: str,
+        email: str,
+        token: str,
+        directory_ttl: float = 900,
+        directory_maxsize: int = 10000,
+        cache: PersistentCache | None = None,
+        ticket_cache_ttl: float = 60,
+        native: bool = False,
+        rate_limit: float = 400,
+        attachment_max_bytes: int = 50 * 1024 * 1024,
+        attachment_inline_max_bytes: int = MAX_ATTACHMENT_INLINE_BYTES,
+        hedge: bool = False,
+        breaker_settings: Dict[str, Any] | None = None,
+        write_coalesce_window: float = 0,
+        prefetch: bool = False,
+        prefetch_comments: int = 3,
+        user_index: bool = False,
+        user_index_refresh: float = 300,
+        metadata_refresh: float = 0,
+        similarity_max_tickets: int = 0
+    ):
         """
         Initialize the Zendesk client using zenpy lib and direct API.
+
+        Args:
+            subdomain: Zendesk subdomain
+            email: Agent email used for API token authentication
+            token: API token
+            directory_ttl: Seconds user/organization/group names are cached for
+            directory_maxsize: Maximum cached records per directory kind
+            cache: Optional on-disk cache shared with other server processes
+            ticket_cache_ttl: Seconds tickets and comments are served from the on-disk cache
+            native: Read and write tickets, comments and articles with direct API calls
+                parsed straight into dicts instead of hydrating zenpy objects
+            rate_limit: Maximum requests per minute across zenpy and direct API calls
+            attachment_max_bytes: Largest attachment download_attachment writes to disk
+            attachment_inline_max_bytes: Most bytes of an attachment read_attachment returns at once
+            hedge: Send a second identical GET when the first is slower than the recent
+                p95 latency of its endpoint family, and use whichever answers first
+            breaker_settings: Thresholds for the per endpoint family circuit breakers
+                (see CircuitBreaker)
+            write_coalesce_window: When positive, update_ticket calls issued within this
+                many seconds are merged per ticket and written together
+            prefetch: After serving a get_tickets page, fetch the next page and the
+                comments of its first prefetch_comments tickets in the background
+            prefetch_comments: Number of tickets per page whose comments are prefetched
+            user_index: Answer search_users lookups by email or external_id from a local
+                index kept current with the incremental users export
+            user_index_refresh: Seconds between incremental refreshes of the user index
+            metadata_refresh: When positive, groups, organizations and ticket fields are
+                cached and reloaded this often, and custom_fields are validated before writes
+            similarity_max_tickets: When positive, subjects and descriptions of up to this
+                many recently read tickets are indexed for find_similar_tickets
         """
+        # Shared by every request this client makes, including concurrent ones
+        self.rate_limiter = RateLimiter(rate_per_minute=rate_limit)
+        self.incremental_limiter = RateLimiter(rate_per_minute=INCREMENTAL_RATE_LIMIT)
+        self.breakers = CircuitBreakers(**(breaker_settings or {}))
+        session = RateLimitedSession(self.rate_limiter, self.breakers)
+        session.mount("https://", HTTPAdapter(**Zenpy.http_adapter_kwargs()))
+
         self.client = Zenpy(
             subdomain=subdomain,
             email=email,
-            token=token
+            token=token,
+            session=session
         )
 
         # For direct API calls
@@ -30,26 +285,242 @@ class ZendeskClient:
         encoded_credentials = base64.b64encode(credentials.encode()).decode('ascii')
         self.auth_header = f"Basic {encoded_credentials}"
 
+        self._count_cache = TTLCache(maxsize=256, ttl=COUNT_CACHE_TTL)
+        self._count_lock = threading.Lock()
+        self.directory = DirectoryCache(maxsize=directory_maxsize, ttl=directory_ttl)
+        self.directory_ttl = directory_ttl
+        self.cache = cache
+        self.ticket_cache_ttl = ticket_cache_ttl
+        # Last shared invalidation applied to the in-memory caches of this process
+        self._invalidation_seq = cache.last_invalidation() if cache else 0
+        self._invalidations_checked_at = 0.0
+        self._invalidation_lock = threading.Lock()
+        self.native = native
+        self.attachment_max_bytes = attachment_max_bytes
+        self.attachment_inline_max_bytes = attachment_inline_max_bytes
+        self.hedge = hedge
+        self._hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="zendesk-hedge") if hedge else None
+        self._write_queue = (
+            TicketWriteQueue(self._write_tickets, window=write_coalesce_window)
+            if write_coalesce_window > 0 else None
+        )
+        self.prefetcher = Prefetcher(self.rate_limiter) if prefetch else None
+        self.prefetch_comments = prefetch_comments
+        self.user_index = UserIndex() if user_index else None
+        self.user_index_refresh = user_index_refresh
+        self._user_index_cursor: str | None = None
+        self._user_index_refreshed_at: float | None = None
+        self._user_index_lock = threading.Lock()
+        self.metadata = MetadataCache() if metadata_refresh > 0 else None
+        self.metadata_refresh = metadata_refresh
+        self._metadata_lock = threading.Lock()
+        self.similarity = SimilarityIndex(similarity_max_tickets) if similarity_max_tickets > 0 else None
+        # mirror path -> modification time when it was last indexed
+        self._indexed_mirrors: Dict[str, float] = {}
+        # url -> (etag, decoded body, stored at) for conditional GETs
+        self._conditional_cache = LRUCache(maxsize=CONDITIONAL_CACHE_SIZE)
+        self._conditional_lock = threading.Lock()
+
+    def _api_url(self, path: str, params: Dict[str, str] | None = None) -> str:
+        """
+        Build an absolute API URL for the given path and query parameters.
+        """
+        url = f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        return url
+
+    def _send_json(self, method: str, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Perform an authenticated request with a JSON body and decode the JSON response.
+        """
+        req = urllib.request.Request(url, data=codec.dumpb(payload), method=method)
+        req.add_header('Authorization', self.auth_header)
+        req.add_header('Content-Type', 'application/json')
+        timeout = request_timeout()
+
+        def send() -> bytes:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                return response.read()
+
+        return codec.loads(self._guarded(url, send))
+
+    def _guarded(self, url: str, send: Callable[[], Any], expected: Callable[[Exception], bool] | None = None) -> Any:
+        """
+        Run send() under the circuit breaker of the url's endpoint family, after
+        taking a rate limiter token. Fails fast while the circuit is open.
+        Errors flagged by expected do not count as breaker failures.
+        """
+        breaker = self.breakers.get(url)
+        breaker.before_request()
+        self.rate_limiter.acquire()
+        return breaker.run(send, expected=expected)
+
+    def _hedged(self, family: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Run an idempotent fetch, issuing a second identical one if the first has not
+        answered within the family's recent p95 latency. The first response wins.
+        """
+        delay = metrics.latency_percentile(family, HEDGE_PERCENTILE)
+        if delay is None:
+            return fetch()
+
+        first = self._hedge_pool.submit(fetch)
+        done, _ = wait([first], timeout=delay)
+        # Never let hedging wait on the rate limiter
+        if done or self.rate_limiter.available() < 1:
+            return first.result()
+
+        self.rate_limiter.acquire()
+        metrics.incr('hedge.fired')
+        second = self._hedge_pool.submit(fetch)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                # An HTTP error is a real answer, only transport failures fall back to the other request
+                if exc is None or isinstance(exc, urllib.error.HTTPError):
+                    if future is second:
+                        metrics.incr('hedge.won')
+                    return future.result()
+                error = error or exc
+        raise error
+
+    def _iter_pages(self, url: str, key: str, conditional: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all records of a paginated list endpoint, following next_page links.
+        """
+        while url:
+            data = self._get_json(url, conditional=conditional)
+            yield from data.get(key, [])
+            url = data.get('next_page') or (
+                data.get('links', {}).get('next') if data.get('meta', {}).get('has_more') else None
+            )
+
+    def _get_validated(self, url: str) -> tuple | None:
+        with self._conditional_lock:
+            validated = self._conditional_cache.get(url)
+        if validated is None and self.cache:
+            entry = self.cache.get('http', url)
+            if entry and entry.etag:
+                validated = (entry.etag, entry.value, entry.stored_at)
+        return validated
+
+    def _store_validated(self, url: str, etag: str, data: Dict[str, Any]) -> None:
+        with self._conditional_lock:
+            self._conditional_cache[url] = (etag, data, time.time())
+        if self.cache:
+            self.cache.set('http', url, data, CONDITIONAL_CACHE_TTL, etag=etag)
+
+    def _get_json(self, url: str, conditional: bool = False, incremental: bool = False) -> Dict[str, Any]:
+        """
+        Perform an authenticated GET request and decode the JSON response.
+
+        With conditional=True, the response ETag is remembered and later requests
+        for the same URL send If-None-Match. A 304 Not Modified answer is served
+        from the stored body, skipping the download and parse entirely.
+
+        With incremental=True (see _get_incremental), the request is never hedged
+        and a 429 answer does not count against the circuit breaker.
+        """
+        validated = self._get_validated(url) if conditional else None
+        family = endpoint_family(url)
+        # Resolved here: hedge threads do not inherit the caller's deadline context
+        timeout = request_timeout()
+
+        def fetch() -> tuple:
+            req = urllib.request.Request(url)
+            req.add_header('Authorization', self.auth_header)
+            req.add_header('Content-Type', 'application/json')
+            if validated:
+                req.add_header('If-None-Match', validated[0])
+
+            started = time.monotonic()
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                body = response.read()
+                etag = response.headers.get('ETag')
+            metrics.record_latency(family, time.monotonic() - started)
+            return body, etag
+
+        try:
+            body, etag = self._guarded(
+                url,
+                lambda: self._hedged(family, fetch) if self.hedge and not incremental else fetch(),
+                expected=is_throttled if incremental else None
+            )
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and validated:
+                with self._conditional_lock:
+                    self._conditional_cache[url] = (validated[0], validated[1], time.time())
+                return validated[1]
+            raise
+
+        data = codec.loads(body)
+
+        if conditional and etag:
+            self._store_validated(url, etag, data)
+        return data
+
+    def _get_incremental(self, url: str) -> Dict[str, Any]:
+        """
+        GET a page of an incremental export, paced to the incremental export rate
+        limit. A 429 answer is waited out for its Retry-After and the page requested
+        again, up to INCREMENTAL_MAX_RETRIES times or until the tool deadline.
+        """
+        for attempt in itertools.count():
+            self.incremental_limiter.acquire()
+            try:
+                return self._get_json(url, incremental=True)
+            except urllib.error.HTTPError as e:
+                if e.code != 429 or attempt >= INCREMENTAL_MAX_RETRIES:
+                    raise
+                metrics.incr('incremental.throttled')
+                retry_after = e.headers.get('Retry-After', '')
+                # Retry-After may also be an HTTP date, which is not worth parsing here
+                retry_after = float(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+                # Raises DeadlineExceeded instead of sleeping past the tool deadline
+                time.sleep(request_timeout(default=retry_after))
+
     def get_ticket(self, ticket_id: int) -> Dict[str, Any]:
         """
         Query a ticket by its ID
         """
+        entry = None
         try:
-            ticket = self.client.tickets(id=ticket_id)
-            return {
-                'id': ticket.id,
-                'subject': ticket.subject,
-                'description': ticket.description,
-                'status': ticket.status,
-                'priority': ticket.priority,
-                'created_at': str(ticket.created_at),
-                'updated_at': str(ticket.updated_at),
-                'requester_id': ticket.requester_id,
-                'assignee_id': ticket.assignee_id,
-                'organization_id': ticket.organization_id,
-                'tags': list(getattr(ticket, 'tags', []) or [])
-            }
+            if self.cache:
+                entry = self.cache.get('tickets', ticket_id)
+                if entry and not entry.expired:
+                    self._index_similar([entry.value])
+                    return entry.value
+
+            if self.native:
+                url = self._api_url(f"/tickets/{ticket_id}.json")
+                result = _ticket_record(self._get_json(url, conditional=True)['ticket'])
+            else:
+                ticket = self.client.tickets(id=ticket_id)
+                result = {
+                    'id': ticket.id,
+                    'subject': ticket.subject,
+                    'description': ticket.description,
+                    'status': ticket.status,
+                    'priority': ticket.priority,
+                    'created_at': str(ticket.created_at),
+                    'updated_at': str(ticket.updated_at),
+                    'requester_id': ticket.requester_id,
+                    'assignee_id': ticket.assignee_id,
+                    'organization_id': ticket.organization_id,
+                    'tags': list(getattr(ticket, 'tags', []) or [])
+                }
+            self._index_similar([result])
+            if self.cache:
+                self.cache.set('tickets', ticket_id, result, self.ticket_cache_ttl)
+            return result
         except Exception as e:
+            # Serve the last known copy while Zendesk is unavailable
+            if entry and is_outage(e):
+                return _mark_stale(entry.value, entry.stored_at)
             raise Exception(f"Failed to get ticket {ticket_id}: {str(e)}")
 
     def get_ticket_comments(self, ticket_id: int) -> List[Dict[str, Any]]:
@@ -57,15 +528,39 @@ class ZendeskClient:
         Get all comments for a specific ticket.
         """
         try:
-            comments = self.client.tickets.comments(ticket=ticket_id)
-            return [{
-                'id': comment.id,
-                'author_id': comment.author_id,
-                'body': comment.body,
-                'html_body': comment.html_body,
-                'public': comment.public,
-                'created_at': str(comment.created_at)
-            } for comment in comments]
+            if self.prefetcher:
+                prefetched = self.prefetcher.take('comments', ticket_id)
+                if prefetched is not None:
+                    return prefetched
+
+            if self.cache:
+                entry = self.cache.get('comments', ticket_id)
+                if entry and not entry.expired:
+                    return entry.value
+
+            if self.native:
+                url = self._api_url(f"/tickets/{ticket_id}/comments.json", {'page[size]': '100'})
+                result = [_comment_record(comment) for comment in self._iter_pages(url, 'comments')]
+            else:
+                comments = self.client.tickets.comments(ticket=ticket_id)
+                result = [{
+                    'id': comment.id,
+                    'author_id': comment.author_id,
+                    'body': comment.body,
+                    'html_body': comment.html_body,
+                    'public': comment.public,
+                    'created_at': str(comment.created_at),
+                    'attachments': [{
+                        'id': attachment.id,
+                        'file_name': attachment.file_name,
+                        'content_type': attachment.content_type,
+                        'size': attachment.size,
+                        'content_url': attachment.content_url
+                    } for attachment in getattr(comment, 'attachments', None) or []]
+                } for comment in comments]
+            if self.cache:
+                self.cache.set('comments', ticket_id, result, self.ticket_cache_ttl)
+            return result
         except Exception as e:
             raise Exception(f"Failed to get comments for ticket {ticket_id}: {str(e)}")
 
@@ -74,16 +569,196 @@ class ZendeskClient:
         Post a comment to an existing ticket.
         """
         try:
+            if self.native:
+                self._send_json('PUT', self._api_url(f"/tickets/{ticket_id}.json"), {
+                    'ticket': {'comment': {'html_body': comment, 'public': public}}
+                })
+                self.invalidate_ticket(ticket_id)
+                return comment
+
             ticket = self.client.tickets(id=ticket_id)
             ticket.comment = Comment(
                 html_body=comment,
                 public=public
             )
             self.client.tickets.update(ticket)
+            self.invalidate_ticket(ticket_id)
             return comment
         except Exception as e:
             raise Exception(f"Failed to post comment on ticket {ticket_id}: {str(e)}")
 
+    def invalidate_ticket(self, ticket_id: int) -> None:
+        """
+        Drop cached copies of a ticket and its comments after it changed.
+        """
+        self._evict_local('ticket', ticket_id)
+        if self.cache:
+            self.cache.delete('tickets', ticket_id)
+            self.cache.delete('comments', ticket_id)
+            self.cache.publish_invalidation('ticket', ticket_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop cached directory entries of a user after it changed.
+        """
+        self._evict_local('user', user_id)
+        if self.cache:
+            self.cache.delete('users', user_id)
+            self.cache.publish_invalidation('user', user_id)
+
+    def invalidate_organization(self, organization_id: int) -> None:
+        """
+        Drop cached directory entries of an organization after it changed.
+        """
+        self._evict_local('organization', organization_id)
+        if self.cache:
+            self.cache.delete('organizations', organization_id)
+            self.cache.publish_invalidation('organization', organization_id)
+
+    def _evict_local(self, kind: str, record_id: int | None) -> None:
+        # Only the in-memory copies of this process, the shared cache is evicted by the publisher
+        if record_id is None:
+            return
+        if kind == 'ticket':
+            if self.prefetcher:
+                self.prefetcher.discard('comments', record_id)
+        elif kind == 'user':
+            self.directory.evict('users', record_id)
+            if self.user_index is not None:
+                self.user_index.remove(record_id)
+        elif kind == 'organization':
+            self.directory.evict('organizations', record_id)
+
+    def sync_invalidations(self) -> List[tuple]:
+        """
+        Apply invalidations other processes published to the persistent cache to
+        the in-memory caches of this process, checking at most every
+        INVALIDATION_POLL_INTERVAL seconds. Returns the (kind, record_id) pairs applied.
+        """
+        if not self.cache:
+            return []
+        with self._invalidation_lock:
+            now = time.monotonic()
+            if now - self._invalidations_checked_at < INVALIDATION_POLL_INTERVAL:
+                return []
+            self._invalidations_checked_at = now
+            self._invalidation_seq, events, missed = self.cache.invalidations_since(self._invalidation_seq)
+        if missed:
+            logger.warning("Cache invalidations were pruned before this process read them, "
+                           "in-memory entries may be stale until they expire")
+        for kind, record_id in events:
+            self._evict_local(kind, record_id)
+        return events
+
+    def get_attachment(self, attachment_id: int) -> Dict[str, Any]:
+        """
+        Get attachment metadata by its ID.
+        """
+        try:
+            data = self._get_json(self._api_url(f"/attachments/{attachment_id}.json"), conditional=True)
+            return _attachment_record(data['attachment'])
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to get attachment {attachment_id}: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to get attachment {attachment_id}: {str(e)}")
+
+    def _open_attachment(self, content_url: str, offset: int = 0, length: int | None = None):
+        req = urllib.request.Request(content_url)
+        # Not forwarded when content_url redirects to the attachment storage host
+        req.add_unredirected_header('Authorization', self.auth_header)
+        if offset or length:
+            end = offset + length - 1 if length else ''
+            req.add_header('Range', f"bytes={offset}-{end}")
+        timeout = request_timeout()
+        return self._guarded(content_url, lambda: urllib.request.urlopen(req, timeout=timeout))
+
+    def read_attachment(self, attachment_id: int, offset: int = 0, length: int = 64 * 1024) -> Dict[str, Any]:
+        """
+        Read a byte range of an attachment. Text content types are decoded, other
+        types are returned base64-encoded. At most attachment_inline_max_bytes are read.
+
+        Args:
+            attachment_id: The ID of the attachment
+            offset: First byte to read
+            length: Number of bytes to read (capped at attachment_inline_max_bytes)
+
+        Raises:
+            ValueError: if offset is negative or length is not positive
+        """
+        if offset < 0:
+            raise ValueError(f"offset must not be negative, got {offset}")
+        if length <= 0:
+            raise ValueError(f"length must be positive, got {length}")
+        try:
+            attachment = self.get_attachment(attachment_id)
+            length = min(length, self.attachment_inline_max_bytes)
+
+            with self._open_attachment(attachment['content_url'], offset, length) as response:
+                # Servers ignoring the Range header send the whole file, skip to the offset
+                skip = offset if response.status != 206 else 0
+                while skip > 0:
+                    chunk = response.read(min(skip, ATTACHMENT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    skip -= len(chunk)
+                content = response.read(length)
+
+            content_type = attachment.get('content_type') or ''
+            result = {
+                **attachment,
+                'offset': offset,
+                'length': len(content),
+                'has_more': offset + len(content) < (attachment.get('size') or 0)
+            }
+            if content_type.startswith(TEXT_CONTENT_TYPES):
+                result['encoding'] = 'text'
+                result['content'] = content.decode('utf-8', errors='replace')
+            else:
+                result['encoding'] = 'base64'
+                result['content'] = base64.b64encode(content).decode('ascii')
+            return result
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to read attachment {attachment_id}: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to read attachment {attachment_id}: {str(e)}")
+
+    def download_attachment(self, attachment_id: int, directory: str | None = None) -> Dict[str, Any]:
+        """
+        Stream an attachment to a temporary file in chunks and return its path.
+        Downloads larger than attachment_max_bytes are aborted and removed.
+
+        Args:
+            attachment_id: The ID of the attachment
+            directory: Directory for the file (defaults to the system temp directory)
+        """
+        try:
+            attachment = self.get_attachment(attachment_id)
+            if (attachment.get('size') or 0) > self.attachment_max_bytes:
+                raise ValueError(f"Attachment is {attachment['size']} bytes, the limit is {self.attachment_max_bytes}")
+
+            suffix = '-' + os.path.basename(attachment.get('file_name') or 'attachment')
+            fd, path = tempfile.mkstemp(prefix=f"zendesk-{attachment_id}-", suffix=suffix, dir=directory)
+            written = 0
+            try:
+                with os.fdopen(fd, 'wb') as f, self._open_attachment(attachment['content_url']) as response:
+                    while chunk := response.read(ATTACHMENT_CHUNK_SIZE):
+                        written += len(chunk)
+                        if written > self.attachment_max_bytes:
+                            raise ValueError(f"Attachment exceeds the {self.attachment_max_bytes} byte limit")
+                        f.write(chunk)
+            except BaseException:
+                os.remove(path)
+                raise
+
+            return {**attachment, 'path': path, 'bytes_written': written}
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to download attachment {attachment_id}: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to download attachment {attachment_id}: {str(e)}")
+
     def get_tickets(
         self,
         page: int = 1,
@@ -144,33 +819,26 @@ class ZendeskClient:
             query_string = urllib.parse.urlencode(params)
             url = f"{self.base_url}{base_path}.json?{query_string}"
 
-            # Create request with auth header
-            req = urllib.request.Request(url)
-            req.add_header('Authorization', self.auth_header)
-            req.add_header('Content-Type', 'application/json')
-
-            # Make the API request
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode())
+            # Make the API request, revalidating a previously seen page by ETag
+            stored_at = None
+            try:
+                data = self.prefetcher.take('page', url) if self.prefetcher else None
+                if data is None:
+                    data = self._get_json(url, conditional=True)
+            except Exception as e:
+                # Serve the last copy of this page while Zendesk is unavailable
+                validated = self._get_validated(url) if is_outage(e) else None
+                if validated is None:
+                    raise
+                data, stored_at = validated[1], validated[2]
 
             tickets_data = data.get('tickets', [])
 
             # Process tickets to return only essential fields
-            ticket_list = []
-            for ticket in tickets_data:
-                ticket_list.append({
-                    'id': ticket.get('id'),
-                    'subject': ticket.get('subject'),
-                    'status': ticket.get('status'),
-                    'priority': ticket.get('priority'),
-                    'description': ticket.get('description'),
-                    'created_at': ticket.get('created_at'),
-                    'updated_at': ticket.get('updated_at'),
-                    'requester_id': ticket.get('requester_id'),
-                    'assignee_id': ticket.get('assignee_id')
-                })
+            ticket_list = [_compact_ticket(ticket) for ticket in tickets_data]
+            self._index_similar(ticket_list)
 
-            return {
+            result = {
                 'tickets': ticket_list,
                 'page': page,
                 'per_page': per_page,
@@ -181,18 +849,575 @@ class ZendeskClient:
                 'next_page': page + 1 if data.get('next_page') else None,
                 'previous_page': page - 1 if data.get('previous_page') and page > 1 else None
             }
+            if stored_at:
+                return _mark_stale(result, stored_at)
+
+            if self.prefetcher:
+                # Agents usually read the next page and the first tickets' comments next
+                if data.get('next_page'):
+                    next_url = f"{self.base_url}{base_path}.json?{urllib.parse.urlencode({**params, 'page': str(page + 1)})}"
+                    self.prefetcher.schedule('page', next_url, lambda: self._get_json(next_url, conditional=True))
+                for ticket in ticket_list[:self.prefetch_comments]:
+                    self.prefetcher.schedule(
+                        'comments', ticket['id'], lambda ticket_id=ticket['id']: self.get_ticket_comments(ticket_id)
+                    )
+            return result
         except urllib.error.HTTPError as e:
             error_body = e.read().decode() if e.fp else "No response body"
             raise Exception(f"Failed to get tickets: HTTP {e.code} - {e.reason}. {error_body}")
         except Exception as e:
             raise Exception(f"Failed to get tickets: {str(e)}")
 
+    def iter_search_export(
+        self,
+        query: str,
+        object_type: str = 'ticket',
+        page_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over search results using the cursor-based search export API.
+
+        Pages are only requested as the iterator is consumed, so callers that stop
+        early never fetch more than they need.
+
+        Args:
+            query: Search query using Zendesk search syntax
+            object_type: Result type to export (ticket, user, organization, group)
+            page_size: Number of results per page (max 1000, 100 recommended)
+
+        Yields:
+            Raw result dicts as returned by the API
+        """
+        params = {
+            'query': query,
+            'filter[type]': object_type,
+            'page[size]': str(min(page_size, 1000))
+        }
+        url = self._api_url("/search/export.json", params)
+        while url:
+            data = self._get_json(url)
+            yield from data.get('results', [])
+            if not data.get('meta', {}).get('has_more'):
+                break
+            url = data.get('links', {}).get('next')
+
+    def search_tickets(self, query: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Search tickets using Zendesk search syntax via the search export API.
+
+        Args:
+            query: Search query using Zendesk search syntax (e.g. 'status:open priority:urgent')
+            limit: Maximum number of tickets to return (capped at MAX_SEARCH_RESULTS)
+
+        Returns:
+            Dict containing matching tickets and whether more results were available
+        """
+        try:
+            limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+            # Read one extra result to know whether the cap truncated the result set
+            results = list(itertools.islice(
+                self.iter_search_export(query, page_size=min(limit + 1, 100)),
+                limit + 1
+            ))
+            ticket_list = [_compact_ticket(ticket) for ticket in results[:limit]]
+            self._index_similar(ticket_list)
+
+            return {
+                'tickets': ticket_list,
+                'query': query,
+                'limit': limit,
+                'count': len(ticket_list),
+                'has_more': len(results) > limit
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to search tickets: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to search tickets: {str(e)}")
+
+    @cachedmethod(lambda self: self._count_cache, lock=lambda self: self._count_lock, key=partial(hashkey, 'count_tickets'))
+    def count_tickets(
+        self,
+        organization_id: int | None = None,
+        user_id: int | None = None,
+        ticket_type: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Count tickets without paging through them. Results are cached for COUNT_CACHE_TTL seconds.
+
+        Args:
+            organization_id: Count tickets of an organization
+            user_id: Count tickets of a user (requires ticket_type)
+            ticket_type: Type of tickets for user ('requested', 'ccd', 'assigned')
+
+        Returns:
+            Dict containing the count and when Zendesk last refreshed it
+        """
+        try:
+            if user_id and not ticket_type:
+                raise ValueError("ticket_type is required when user_id is provided")
+            if ticket_type and not user_id:
+                raise ValueError("user_id is required when ticket_type is provided")
+            if ticket_type and ticket_type not in ['requested', 'ccd', 'assigned']:
+                raise ValueError(f"Invalid ticket_type: {ticket_type}. Must be one of: requested, ccd, assigned")
+
+            if ticket_type == 'requested':
+                # There is no requested count endpoint; the related-info endpoint carries it
+                data = self._get_json(self._api_url(f"/users/{user_id}/related.json"))
+                return {
+                    'count': data.get('user_related', {}).get('requested_tickets'),
+                    'refreshed_at': None,
+                    'user_id': user_id,
+                    'ticket_type': ticket_type
+                }
+
+            if organization_id:
+                path = f"/organizations/{organization_id}/tickets/count.json"
+            elif user_id:
+                path = f"/users/{user_id}/tickets/{ticket_type}/count.json"
+            else:
+                path = "/tickets/count.json"
+
+            count = self._get_json(self._api_url(path)).get('count', {})
+            return {
+                'count': count.get('value'),
+                'refreshed_at': count.get('refreshed_at'),
+                'organization_id': organization_id,
+                'user_id': user_id,
+                'ticket_type': ticket_type
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to count tickets: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to count tickets: {str(e)}")
+
+    @cachedmethod(lambda self: self._count_cache, lock=lambda self: self._count_lock, key=partial(hashkey, 'count_search'))
+    def count_search(self, query: str) -> Dict[str, Any]:
+        """
+        Count search results for a query without fetching them.
+        Results are cached for COUNT_CACHE_TTL seconds.
+
+        Args:
+            query: Search query using Zendesk search syntax (e.g. 'type:ticket status:open')
+
+        Returns:
+            Dict containing the query and its result count
+        """
+        try:
+            data = self._get_json(self._api_url("/search/count.json", {'query': query}))
+            return {
+                'query': query,
+                'count': data.get('count')
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to count search results: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to count search results: {str(e)}")
+
+    def aggregate_tickets(
+        self,
+        query: str | None = None,
+        mirror_path: str | None = None,
+        filters: Dict[str, Any] | None = None,
+        group_by: List[str] | None = None,
+        oldest_limit: int = 10,
+        max_tickets: int = 10000
+    ) -> Dict[str, Any]:
+        """
+        Compute a summary over a ticket set in a single streaming pass.
+
+        Tickets are streamed from the search export API, or read from a local NDJSON
+        mirror when mirror_path is given, so only the summary is held in memory.
+
+        Args:
+            query: Search query using Zendesk search syntax selecting the tickets
+            mirror_path: Path to a local NDJSON (or .ndjson.gz) file of raw tickets
+            filters: Field equality filters applied locally, list values match any item
+            group_by: Ticket fields to break counts down by (e.g. ['assignee_id', 'priority'])
+            oldest_limit: Number of oldest unresolved tickets to include
+            max_tickets: Maximum number of tickets to scan (capped at MAX_AGGREGATE_TICKETS)
+
+        Returns:
+            Dict containing group counts, age percentiles and oldest unresolved tickets
+        """
+        try:
+            if not query and not mirror_path:
+                raise ValueError("Either 'query' or 'mirror_path' must be provided")
+
+            max_tickets = max(1, min(max_tickets, MAX_AGGREGATE_TICKETS))
+            aggregator = TicketAggregator(group_by=group_by, oldest_limit=oldest_limit)
+
+            if mirror_path:
+                tickets = iter_ndjson_tickets(mirror_path)
+            else:
+                tickets = self.iter_search_export(query, page_size=1000)
+            matching = (ticket for ticket in tickets if matches_filters(ticket, filters))
+
+            # One ticket past the limit tells a capped set apart from one that fits exactly
+            truncated = False
+            for ticket in itertools.islice(matching, max_tickets + 1):
+                if aggregator.total == max_tickets:
+                    truncated = True
+                    break
+                aggregator.add(ticket)
+
+            summary = aggregator.summary()
+            summary['source'] = 'mirror' if mirror_path else 'search'
+            summary['truncated'] = truncated
+            return summary
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to aggregate tickets: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to aggregate tickets: {str(e)}")
+
+    def export_tickets(
+        self,
+        path: str,
+        start_time: int | str,
+        end_time: int | str | None = None,
+        include_comments: bool = False,
+        compress: bool | None = None,
+        resume: bool = True,
+        comment_concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Stream tickets updated in a time range from the incremental export API to a
+        local NDJSON file of raw tickets, usable as aggregate_tickets' mirror_path.
+
+        A checkpoint with the export cursor is saved next to the file after every
+        page, so an interrupted export resumes where it stopped. It is removed once
+        the export completes. Pages are requested no faster than the incremental
+        export rate limit allows, and throttled pages are retried after Retry-After.
+
+        Args:
+            path: Output file, gzip-compressed when it ends with .gz (or compress=True)
+            start_time: Export tickets updated at or after this time (unix seconds or ISO 8601)
+            end_time: Skip tickets updated after this time, and stop at the first page reaching past it
+            include_comments: Add each ticket's comments under 'comments', fetched concurrently
+            compress: Force gzip compression on or off
+            resume: Continue from the checkpoint of an earlier run with the same arguments
+            comment_concurrency: Number of tickets whose comments are fetched at once
+
+        Returns:
+            Dict with the path and ticket/comment counts
+        """
+        try:
+            path = os.path.expanduser(path)
+            compress = path.endswith('.gz') if compress is None else compress
+            start = parse_timestamp(start_time)
+            end = parse_timestamp(end_time) if end_time is not None else None
+
+            checkpoint = ExportCheckpoint.load(path) if resume else None
+            resumed = bool(checkpoint and checkpoint.matches(start, end, include_comments))
+            if resumed:
+                # Drop whatever an interrupted page left behind
+                with open(path, 'ab') as f:
+                    f.truncate(checkpoint.offset)
+            else:
+                checkpoint = ExportCheckpoint(start_time=start, end_time=end, include_comments=include_comments)
+                open(path, 'wb').close()
+            written = 0
+
+            if checkpoint.cursor:
+                url = self._api_url("/incremental/tickets/cursor.json", {
+                    'cursor': checkpoint.cursor, 'per_page': str(EXPORT_PAGE_SIZE)
+                })
+            else:
+                url = self._api_url("/incremental/tickets/cursor.json", {
+                    'start_time': str(start), 'per_page': str(EXPORT_PAGE_SIZE)
+                })
+
+            pool = ThreadPoolExecutor(max_workers=comment_concurrency) if include_comments else None
+            try:
+                while url:
+                    data = self._get_incremental(url)
+                    page = data.get('tickets', [])
+                    tickets = [
+                        ticket for ticket in page
+                        if end is None or not ticket.get('updated_at') or parse_timestamp(ticket['updated_at']) <= end
+                    ]
+                    # Pages are ordered by change time, nothing after this one falls in the range
+                    past_end = end is not None and (len(tickets) < len(page) or (data.get('end_time') or 0) > end)
+                    if pool:
+                        # Each task runs in a copy of this context so it keeps the caller's deadline
+                        futures = [
+                            pool.submit(contextvars.copy_context().run, self._export_comments, ticket['id'])
+                            for ticket in tickets
+                        ]
+                        for ticket, future in zip(tickets, futures):
+                            ticket['comments'] = future.result()
+                            checkpoint.comments += len(ticket['comments'])
+
+                    self._index_similar(tickets)
+                    checkpoint.offset = append_ndjson(path, tickets, compress)
+                    checkpoint.tickets += len(tickets)
+                    written += len(tickets)
+                    checkpoint.cursor = data.get('after_cursor') or checkpoint.cursor
+                    checkpoint.save(path)
+
+                    url = None if data.get('end_of_stream') or past_end else data.get('after_url')
+            finally:
+                if pool:
+                    pool.shutdown(cancel_futures=True)
+
+            ExportCheckpoint.remove(path)
+            return {
+                'path': path,
+                'tickets': checkpoint.tickets,
+                'comments': checkpoint.comments if include_comments else None,
+                'written_this_run': written,
+                'resumed': resumed,
+                'bytes': os.path.getsize(path)
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to export tickets: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to export tickets: {str(e)}")
+
+    def get_ticket_changes(
+        self,
+        cursor: str | None = None,
+        start_time: int | str | None = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Tickets created or updated since a cursor, read from one page of the incremental
+        ticket export. Pass the returned cursor to the next call to get only later changes.
+
+        Args:
+            cursor: Cursor returned by a previous call
+            start_time: Without a cursor, report changes since this time (unix seconds or
+                ISO 8601), by default the last hour
+            limit: Maximum tickets per call (at most EXPORT_PAGE_SIZE); has_more tells
+                whether more changes are waiting behind the returned cursor
+
+        Returns:
+            Dict with the changed tickets, the cursor to poll with next and has_more
+        """
+        try:
+            params = {'per_page': str(max(1, min(limit, EXPORT_PAGE_SIZE)))}
+            if cursor:
+                params['cursor'] = cursor
+            else:
+                now = int(time.time())
+                start = parse_timestamp(start_time) if start_time is not None else now - CHANGES_DEFAULT_LOOKBACK
+                params['start_time'] = str(min(start, now - INCREMENTAL_MIN_AGE))
+
+            data = self._get_incremental(self._api_url("/incremental/tickets/cursor.json", params))
+            # A ticket changed more than once can appear repeatedly, keep its latest version
+            changed = {ticket['id']: ticket for ticket in data.get('tickets', [])}
+            for ticket_id in changed:
+                self.invalidate_ticket(ticket_id)
+            self._index_similar(changed.values())
+
+            return {
+                'tickets': [_compact_ticket(ticket) for ticket in changed.values()],
+                'count': len(changed),
+                'cursor': data.get('after_cursor') or cursor,
+                'has_more': not data.get('end_of_stream', True)
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to get ticket changes: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to get ticket changes: {str(e)}")
+
+    def _index_similar(self, tickets: Iterable[Dict[str, Any]]) -> None:
+        if self.similarity is not None:
+            self.similarity.add_many(tickets)
+
+    def index_mirror(self, path: str) -> int:
+        """
+        Add the tickets of a local NDJSON mirror to the similarity index, unless the
+        file is unchanged since it was last indexed. Returns the number of tickets indexed.
+        """
+        path = os.path.expanduser(path)
+        modified = os.path.getmtime(path)
+        if self._indexed_mirrors.get(path) == modified:
+            return 0
+        tickets = iter_ndjson_tickets(path)
+        indexed = 0
+        # In chunks, so queries are not locked out while a large mirror is indexed
+        while chunk := list(itertools.islice(tickets, SIMILARITY_INDEX_CHUNK)):
+            indexed += self.similarity.add_many(chunk)
+        self._indexed_mirrors[path] = modified
+        return indexed
+
+    def find_similar_tickets(
+        self,
+        ticket_id: int | None = None,
+        text: str | None = None,
+        limit: int = 5,
+        min_score: float = 0.1,
+        mirror_path: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Find indexed tickets whose subject and description resemble a ticket or free text,
+        ranked by TF-IDF cosine similarity. Only tickets this process has read (or the
+        given mirror holds) are candidates.
+
+        Args:
+            ticket_id: Ticket to find similar tickets for; fetched once when not indexed yet
+            text: Free text to compare against, used when ticket_id is not given
+            limit: Maximum number of similar tickets (max 50)
+            min_score: Lowest similarity reported, between 0 and 1
+            mirror_path: Local NDJSON mirror (e.g. written by export_tickets) to index first
+
+        Returns:
+            Dict with the similar tickets and their scores, and the index size
+        """
+        try:
+            if self.similarity is None:
+                raise ValueError("the similarity index is disabled")
+            if ticket_id is None and not text:
+                raise ValueError("Either 'ticket_id' or 'text' must be provided")
+            if mirror_path:
+                self.index_mirror(mirror_path)
+            if ticket_id is not None and ticket_id not in self.similarity:
+                # get_ticket indexes the ticket as a side effect
+                self.get_ticket(ticket_id)
+
+            started = time.perf_counter()
+            similar = self.similarity.similar(
+                ticket_id=ticket_id,
+                text=None if ticket_id is not None else text,
+                limit=max(1, min(limit, 50)),
+                min_score=min_score
+            )
+            return {
+                'tickets': similar,
+                'count': len(similar),
+                'indexed_tickets': len(self.similarity),
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+            }
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to find similar tickets: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to find similar tickets: {str(e)}")
+
+    def _export_comments(self, ticket_id: int) -> List[Dict[str, Any]]:
+        url = self._api_url(f"/tickets/{ticket_id}/comments.json", {'page[size]': '100'})
+        return [_comment_record(comment) for comment in self._iter_pages(url, 'comments')]
+
+    def _resolve(
+        self,
+        kind: str,
+        ids: Iterable[int | None],
+        fetch: Callable[[List[int]], List[Dict[str, Any]]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve ids through the directory cache, fetching only the missing ones.
+        """
+        found, missing = self.directory.get_many(kind, ids)
+        if missing and self.cache:
+            # Second tier: records another server process already fetched
+            entries = self.cache.get_many(kind, missing)
+            records = [entry.value for entry in entries.values()]
+            self.directory.put_many(kind, records)
+            found.update((record['id'], record) for record in records)
+            missing = [record_id for record_id in missing if str(record_id) not in entries]
+        if missing:
+            records = fetch(missing)
+            self.directory.put_many(kind, records)
+            if self.cache:
+                self.cache.set_many(kind, {record['id']: record for record in records}, self.directory_ttl)
+            found.update((record['id'], record) for record in records)
+        return found
+
+    def _show_many(self, kind: str, ids: List[int], compact: Callable) -> List[Dict[str, Any]]:
+        records = []
+        for start in range(0, len(ids), SHOW_MANY_BATCH_SIZE):
+            batch = ids[start:start + SHOW_MANY_BATCH_SIZE]
+            url = self._api_url(f"/{kind}/show_many.json", {'ids': ','.join(str(i) for i in batch)})
+            records.extend(compact(record) for record in self._get_json(url, conditional=True).get(kind, []))
+        return records
+
+    def _fetch_groups(self, ids: List[int]) -> List[Dict[str, Any]]:
+        # Groups have no show_many endpoint, but accounts only have a handful of them
+        return [
+            compact_group(self._get_json(self._api_url(f"/groups/{group_id}.json"), conditional=True).get('group', {}))
+            for group_id in ids
+        ]
+
+    def resolve_users(self, user_ids: Iterable[int | None]) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve user ids to compact user records using batched show_many requests.
+        """
+        try:
+            return self._resolve('users', user_ids, lambda ids: self._show_many('users', ids, compact_user))
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to resolve users: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to resolve users: {str(e)}")
+
+    def resolve_organizations(self, organization_ids: Iterable[int | None]) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve organization ids to compact organization records using batched show_many requests.
+        """
+        try:
+            return self._resolve(
+                'organizations',
+                organization_ids,
+                lambda ids: self._show_many('organizations', ids, compact_organization)
+            )
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to resolve organizations: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to resolve organizations: {str(e)}")
+
+    def resolve_groups(self, group_ids: Iterable[int | None]) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve group ids to compact group records.
+        """
+        try:
+            return self._resolve('groups', group_ids, self._fetch_groups)
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to resolve groups: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to resolve groups: {str(e)}")
+
+    def enrich_tickets(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add requester, assignee and organization names to ticket dicts in place.
+        All ids across the tickets are resolved together in as few requests as possible.
+        """
+        users = self.resolve_users(
+            user_id for ticket in tickets for user_id in (ticket.get('requester_id'), ticket.get('assignee_id'))
+        )
+        organizations = self.resolve_organizations(ticket.get('organization_id') for ticket in tickets)
+        for ticket in tickets:
+            ticket['requester_name'] = users.get(ticket.get('requester_id'), {}).get('name')
+            ticket['assignee_name'] = users.get(ticket.get('assignee_id'), {}).get('name')
+            if 'organization_id' in ticket:
+                ticket['organization_name'] = organizations.get(ticket.get('organization_id'), {}).get('name')
+        return tickets
+
+    def enrich_comments(self, comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add author names to comment dicts in place.
+        """
+        users = self.resolve_users(comment.get('author_id') for comment in comments)
+        for comment in comments:
+            comment['author_name'] = users.get(comment.get('author_id'), {}).get('name')
+        return comments
+
     def get_all_articles(self) -> Dict[str, Any]:
         """
         Fetch help center articles as knowledge base.
         Returns a Dict of section -> [article].
         """
         try:
+            if self.native:
+                return self._native_get_all_articles()
+
             # Get all sections
             sections = self.client.help_center.sections()
 
@@ -216,6 +1441,59 @@ class ZendeskClient:
         except Exception as e:
             raise Exception(f"Failed to fetch knowledge base: {str(e)}")
 
+    def _native_get_all_articles(self) -> Dict[str, Any]:
+        kb = {}
+        sections_url = self._api_url("/help_center/sections.json", {'per_page': '100'})
+        for section in self._iter_pages(sections_url, 'sections', conditional=True):
+            articles_url = self._api_url(
+                f"/help_center/sections/{section['id']}/articles.json", {'per_page': '100'}
+            )
+            kb[section.get('name')] = {
+                'section_id': section.get('id'),
+                'description': section.get('description'),
+                'articles': [{
+                    'id': article.get('id'),
+                    'title': article.get('title'),
+                    'body': article.get('body'),
+                    'updated_at': article.get('updated_at'),
+                    'url': article.get('html_url')
+                } for article in self._iter_pages(articles_url, 'articles', conditional=True)]
+            }
+        return kb
+
+    def get_article_body(self, article_id: int) -> str | None:
+        """
+        Fetch the HTML body of a single help center article.
+        """
+        try:
+            url = self._api_url(f"/help_center/articles/{article_id}.json")
+            return self._get_json(url, conditional=True).get('article', {}).get('body')
+        except Exception as e:
+            raise Exception(f"Failed to get article {article_id}: {str(e)}")
+
+    def search_articles(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search help center articles and return the best matches without their bodies.
+
+        Args:
+            query: Free text to match against article titles and bodies
+            limit: Maximum number of articles to return (max 100)
+        """
+        try:
+            params = {'query': query, 'per_page': str(max(1, min(limit, 100)))}
+            data = self._get_json(self._api_url("/help_center/articles/search.json", params))
+            return [{
+                'id': article.get('id'),
+                'title': article.get('title'),
+                'snippet': article.get('snippet'),
+                'url': article.get('html_url')
+            } for article in data.get('results', [])[:limit]]
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to search articles: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to search articles: {str(e)}")
+
     def create_ticket(
         self,
         subject: str,
@@ -238,9 +1516,27 @@ class ZendeskClient:
             priority: Optional priority (low, normal, high, urgent)
             type: Optional ticket type (problem, incident, question, task)
             tags: Optional list of tags
-            custom_fields: Optional list of dicts: {id: int, value: Any}
+            custom_fields: Optional list of dicts: {id: int, value: Any}, validated against
+                the cached ticket fields when the metadata cache is enabled
         """
         try:
+            self._validate_custom_fields(custom_fields)
+            if self.native:
+                payload = {
+                    'subject': subject,
+                    'comment': {'body': description},
+                    'requester_id': requester_id,
+                    'assignee_id': assignee_id,
+                    'priority': priority,
+                    'type': type,
+                    'tags': tags,
+                    'custom_fields': custom_fields,
+                }
+                data = self._send_json('POST', self._api_url("/tickets.json"), {
+                    'ticket': {key: value for key, value in payload.items() if value is not None}
+                })
+                return _written_ticket_record(data['ticket'])
+
             ticket = ZenpyTicket(
                 subject=subject,
                 description=description,
@@ -285,8 +1581,24 @@ class ZendeskClient:
         Supported fields include common ticket attributes like:
         subject, status, priority, type, assignee_id, requester_id,
         tags (list[str]), custom_fields (list[dict]), due_at, etc.
+
+        With the write queue enabled, the call blocks until the merged write that
+        includes these fields has completed and returns the ticket as written.
         """
         try:
+            self._validate_custom_fields(fields.get('custom_fields'))
+            if self._write_queue:
+                fields = {key: value for key, value in fields.items() if value is not None}
+                return self._write_queue.submit(ticket_id, fields).result()
+
+            if self.native:
+                # A single PUT returns the updated ticket, no need to load or refresh it
+                data = self._send_json('PUT', self._api_url(f"/tickets/{ticket_id}.json"), {
+                    'ticket': {key: value for key, value in fields.items() if value is not None}
+                })
+                self.invalidate_ticket(ticket_id)
+                return _written_ticket_record(data['ticket'])
+
             # Load the ticket, mutate fields directly, and update
             ticket = self.client.tickets(id=ticket_id)
             for key, value in fields.items():
@@ -299,6 +1611,7 @@ class ZendeskClient:
 
             # Fetch the fresh ticket to return consistent data
             refreshed = self.client.tickets(id=ticket_id)
+            self.invalidate_ticket(ticket_id)
 
             return {
                 'id': refreshed.id,
@@ -317,6 +1630,54 @@ class ZendeskClient:
         except Exception as e:
             raise Exception(f"Failed to update ticket {ticket_id}: {str(e)}")
 
+    def _write_tickets(self, updates: Dict[int, Dict[str, Any]]) -> Dict[int, Any]:
+        """
+        Write merged ticket updates: a single PUT for one ticket, otherwise one
+        update_many job. Returns the written ticket record or the error per ticket id.
+        """
+        if len(updates) == 1:
+            ticket_id, fields = next(iter(updates.items()))
+            try:
+                data = self._send_json('PUT', self._api_url(f"/tickets/{ticket_id}.json"), {'ticket': fields})
+            except urllib.error.HTTPError as e:
+                error_body = e.read().decode() if e.fp else "No response body"
+                return {ticket_id: Exception(f"HTTP {e.code} - {e.reason}. {error_body}")}
+            except Exception as e:
+                return {ticket_id: e}
+            finally:
+                self.invalidate_ticket(ticket_id)
+            return {ticket_id: _written_ticket_record(data['ticket'])}
+
+        job = self._send_json('PUT', self._api_url("/tickets/update_many.json"), {
+            'tickets': [{'id': ticket_id, **fields} for ticket_id, fields in updates.items()]
+        })['job_status']
+        job = self._wait_for_job(job)
+        for ticket_id in updates:
+            self.invalidate_ticket(ticket_id)
+
+        results: Dict[int, Any] = {}
+        for item in job.get('results') or []:
+            if item.get('error') or item.get('success') is False:
+                results[item.get('id')] = Exception(f"{item.get('error')}: {item.get('details')}")
+        written = [ticket_id for ticket_id in updates if ticket_id not in results]
+        for record in self._show_many('tickets', written, _written_ticket_record):
+            results[record['id']] = record
+        return results
+
+    def _wait_for_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Poll a job status until it has finished, returning the completed job.
+        """
+        timeout_at = time.monotonic() + JOB_TIMEOUT
+        while job.get('status') not in ('completed', 'failed', 'killed'):
+            if time.monotonic() > timeout_at:
+                raise TimeoutError(f"Job {job.get('id')} did not complete within {JOB_TIMEOUT} seconds")
+            time.sleep(JOB_POLL_INTERVAL)
+            job = self._get_json(self._api_url(f"/job_statuses/{job['id']}.json"))['job_status']
+        if job['status'] != 'completed':
+            raise Exception(f"Job {job.get('id')} {job['status']}: {job.get('message')}")
+        return job
+
     def list_users(
         self,
         page: int = 1,
@@ -362,16 +1723,12 @@ class ZendeskClient:
             query_string = urllib.parse.urlencode(params)
             url = f"{self.base_url}{base_path}.json?{query_string}"
 
-            # Create request with auth header
-            req = urllib.request.Request(url)
-            req.add_header('Authorization', self.auth_header)
-            req.add_header('Content-Type', 'application/json')
-
-            # Make the API request
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode())
+            # Make the API request, revalidating a previously seen page by ETag
+            data = self._get_json(url, conditional=True)
 
             users_data = data.get('users', [])
+            if self.user_index is not None:
+                self.user_index.upsert_many(_user_record(user) for user in users_data)
 
             # Process users to return essential fields
             user_list = []
@@ -430,6 +1787,19 @@ class ZendeskClient:
             # Cap at reasonable limit
             per_page = min(per_page, 100)
 
+            if self.user_index is not None and page == 1:
+                indexed = self._lookup_user_index(query, external_id)
+                if indexed:
+                    return {
+                        'users': [indexed],
+                        'page': 1,
+                        'per_page': per_page,
+                        'count': 1,
+                        'has_more': False,
+                        'next_page': None,
+                        'previous_page': None
+                    }
+
             # Build URL with parameters
             params = {
                 'page': str(page),
@@ -443,31 +1813,15 @@ class ZendeskClient:
             query_string = urllib.parse.urlencode(params)
             url = f"{self.base_url}/users/search.json?{query_string}"
 
-            # Create request with auth header
-            req = urllib.request.Request(url)
-            req.add_header('Authorization', self.auth_header)
-            req.add_header('Content-Type', 'application/json')
-
-            # Make the API request
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode())
+            # Make the API request, revalidating a previously seen page by ETag
+            data = self._get_json(url, conditional=True)
 
             users_data = data.get('users', [])
 
             # Process users to return essential fields
-            user_list = []
-            for user in users_data:
-                user_list.append({
-                    'id': user.get('id'),
-                    'name': user.get('name'),
-                    'email': user.get('email'),
-                    'role': user.get('role'),
-                    'active': user.get('active'),
-                    'created_at': user.get('created_at'),
-                    'updated_at': user.get('updated_at'),
-                    'organization_id': user.get('organization_id'),
-                    'external_id': user.get('external_id')
-                })
+            user_list = [_user_record(user) for user in users_data]
+            if self.user_index is not None:
+                self.user_index.upsert_many(user_list)
 
             return {
                 'users': user_list,
@@ -482,4 +1836,167 @@ class ZendeskClient:
             error_body = e.read().decode() if e.fp else "No response body"
             raise Exception(f"Failed to search users: HTTP {e.code} - {e.reason}. {error_body}")
         except Exception as e:
-            raise Exception(f"Failed to search users: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to search users: {str(e)}")
+
+    def _lookup_user_index(self, query: str | None, external_id: str | None) -> Dict[str, Any] | None:
+        """
+        Answer a single-user lookup by external_id or email from the local index.
+        """
+        self._refresh_user_index_async()
+        if external_id and not query:
+            return self.user_index.by_external_id(external_id)
+        match = EMAIL_QUERY.match(query or '')
+        if match and not external_id:
+            return self.user_index.by_email(match.group(1))
+        return None
+
+    def _refresh_user_index_async(self) -> None:
+        due = (
+            self._user_index_refreshed_at is None
+            or time.monotonic() - self._user_index_refreshed_at >= self.user_index_refresh
+        )
+        if due and not self._user_index_lock.locked():
+            threading.Thread(target=self.refresh_user_index, name="zendesk-user-index", daemon=True).start()
+
+    def refresh_user_index(self) -> int:
+        """
+        Bring the user index up to date with the incremental users export. The
+        first refresh loads every user, later ones only users changed since.
+        Pages are paced to the incremental export rate limit, and a refresh that
+        fails continues from the last page applied. Returns the number of user
+        records applied.
+        """
+        if not self._user_index_lock.acquire(blocking=False):
+            return 0
+        applied = 0
+        try:
+            params = {'per_page': str(EXPORT_PAGE_SIZE)}
+            if self._user_index_cursor:
+                params['cursor'] = self._user_index_cursor
+            else:
+                params['start_time'] = '0'
+            url = self._api_url("/incremental/users/cursor.json", params)
+            while url:
+                data = self._get_incremental(url)
+                users = data.get('users', [])
+                self.user_index.upsert_many(_user_record(user) for user in users)
+                applied += len(users)
+                self._user_index_cursor = data.get('after_cursor') or self._user_index_cursor
+                url = None if data.get('end_of_stream') else data.get('after_url')
+        except Exception as e:
+            logger.warning(f"Failed to refresh user index: {e}")
+        finally:
+            # Also after a failure, so a broken export is not retried on every lookup
+            self._user_index_refreshed_at = time.monotonic()
+            self._user_index_lock.release()
+        return applied
+
+    def _load_metadata(self, kinds: Iterable[str]) -> None:
+        for kind in kinds:
+            limit = METADATA_MAX_ORGANIZATIONS if kind == 'organizations' else None
+            pages = self._iter_pages(self._api_url(f"/{kind}.json", {'per_page': '100'}), kind, conditional=True)
+            records = list(itertools.islice(pages, limit + 1 if limit else None))
+            truncated = limit is not None and len(records) > limit
+            compacted = self.metadata.replace(kind, records[:limit], truncated=truncated)
+            if kind != 'ticket_fields':
+                # Names for enrich_tickets come for free
+                self.directory.put_many(kind, compacted)
+
+    def refresh_metadata(self, kinds: Iterable[str] = METADATA_KINDS) -> Dict[str, Any]:
+        """
+        Reload groups, organizations and ticket fields into the metadata cache.
+        Returns the record count and load time per kind.
+        """
+        with self._metadata_lock:
+            self._load_metadata(kinds)
+        return self.metadata.stats()
+
+    def _ensure_metadata(self, kind: str) -> None:
+        with self._metadata_lock:
+            if not self.metadata.loaded(kind):
+                self._load_metadata([kind])
+
+    def start_metadata_refresh(self) -> threading.Thread | None:
+        """
+        Load the metadata cache in the background now and every metadata_refresh seconds.
+        """
+        if self.metadata is None:
+            return None
+
+        def run() -> None:
+            while True:
+                try:
+                    self.refresh_metadata()
+                except Exception as e:
+                    logger.warning(f"Failed to refresh metadata: {e}")
+                time.sleep(self.metadata_refresh)
+
+        thread = threading.Thread(target=run, name="zendesk-metadata", daemon=True)
+        thread.start()
+        return thread
+
+    def resolve_names(self, kind: str, names: List[str] | None = None, limit: int = 25) -> Dict[str, Any]:
+        """
+        Resolve group, organization or ticket field names to ids from the metadata cache.
+
+        Args:
+            kind: groups, organizations or ticket_fields
+            names: Names to resolve, matched exactly ignoring case or else as a substring.
+                Lists the cached records of the kind when omitted.
+            limit: Maximum matches per name, or records listed
+
+        Returns:
+            Matching records (ticket fields with their type and options) per name
+        """
+        try:
+            if self.metadata is None:
+                raise ValueError("the metadata cache is disabled")
+            if kind not in METADATA_KINDS:
+                raise ValueError(f"kind must be one of {', '.join(METADATA_KINDS)}")
+            self._ensure_metadata(kind)
+
+            if not names:
+                records = self.metadata.all(kind)
+                return {
+                    'kind': kind,
+                    'records': records[:limit],
+                    'total': len(records),
+                    'truncated': kind in self.metadata.truncated
+                }
+
+            matches = {}
+            for name in names:
+                found = self.metadata.resolve(kind, name, limit)
+                if not found and kind in self.metadata.truncated and len(name.strip()) >= 2:
+                    # Only part of the organizations are cached, ask the API for the rest
+                    url = self._api_url("/organizations/autocomplete.json", {'name': name.strip()})
+                    organizations = self._get_json(url, conditional=True).get('organizations', [])
+                    found = [compact_organization(organization) for organization in organizations][:limit]
+                matches[name] = found
+            return {'kind': kind, 'matches': matches}
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode() if e.fp else "No response body"
+            raise Exception(f"Failed to resolve names: HTTP {e.code} - {e.reason}. {error_body}")
+        except Exception as e:
+            raise Exception(f"Failed to resolve names: {str(e)}")
+
+    def _validate_custom_fields(self, custom_fields: List[Dict[str, Any]] | None) -> None:
+        """
+        Raise ValueError when custom_fields do not fit the cached ticket fields.
+        Validation is skipped when the fields cannot be loaded; the API still checks.
+        """
+        if self.metadata is None or not custom_fields:
+            return
+        try:
+            self._ensure_metadata('ticket_fields')
+            errors = self.metadata.validate_custom_fields(custom_fields)
+            stale = time.time() - self.metadata.loaded_at['ticket_fields'] >= METADATA_MIN_RELOAD
+            if stale and any(error.startswith('unknown ticket field') for error in errors):
+                # The field may have been created since the last load
+                self.refresh_metadata(['ticket_fields'])
+                errors = self.metadata.validate_custom_fields(custom_fields)
+        except Exception as e:
+            logger.warning(f"Skipping custom field validation: {e}")
+            return
+        if errors:
+            raise ValueError(f"Invalid custom_fields: {'; '.join(errors)}")